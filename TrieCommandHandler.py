@@ -1,13 +1,22 @@
+import os
+
 from trie import Trie
+from persistent_trie import PersistentTrie, EditHistory, describe_edit
+from text_normalize import is_keyword
 from user_interface import UserInterface
 from TrieVisualiser import TrieVisualizer
+from text_restorer import restore_file, print_restore_report
+from trie_cache import shared_trie_cache
 
 
 UI = UserInterface()
 
 class TrieCommandHandler:
-    def __init__(self, trie=None):
+    # normalize: keyword normalisation for the trie built by construct_edit, e.g.
+    # 'nfkc_casefold' so that 'Car' and 'car' share one branch (None keeps keywords as typed)
+    def __init__(self, trie=None, normalize=None):
         self.trie = trie if trie else Trie()
+        self.normalize = normalize
         self.recent_rounds = []
         self.visualizer = TrieVisualizer(self.trie)
 
@@ -28,38 +37,52 @@ class TrieCommandHandler:
         print("Exiting program.")
         exit()
 
+    # Display the trie page by page. arg is '[prefix] [depth=N] [lines=N]'
+    def display_trie(self, arg=''):
+        prefix, max_depth, max_lines = '', None, None
+        for part in arg.split():
+            key, _, value = part.partition('=')
+            if key in ('depth', 'lines') and value.isdigit():
+                if key == 'depth':
+                    max_depth = int(value)
+                else:
+                    max_lines = int(value)
+            else:
+                prefix = part
+        UI.page_output(self.trie.iter_visual_lines(max_depth=max_depth, prefix=prefix, max_lines=max_lines))
+
     # Autocomplete game
-    def _autoComplete_recursive(self, prefix, guesses):
-        suggestions = self.trie.get_words_with_prefix(prefix)
-        if not suggestions:
-            print("No more suggestions. Ending round.")
-            return guesses
-
-        current_guesses = suggestions[:3]
-        UI.Game_UI(current_guesses)
-
-        user_input = input("Is the word one of these? Enter number (1-3), or 'n' for none: ").strip().lower()
-        if user_input in ['1', '2', '3']:
-            chosen_index = int(user_input) - 1
-            if chosen_index < len(current_guesses):
-                chosen_word = current_guesses[chosen_index]
-                print(f"Great! The word is '{chosen_word}'.")
-                guesses.append(chosen_word)
+    def _autoComplete_loop(self, prefix):
+        # One round: a cursor follows the prefix, so each refinement only walks the new letters
+        guesses = []
+        cursor = self.trie.completion_cursor(prefix)
+        current_guesses = cursor.top(3)
+        while True:
+            if not current_guesses:
+                print("No more suggestions. Ending round.")
                 return guesses
-            else:
+
+            UI.Game_UI(current_guesses)
+
+            user_input = input("Is the word one of these? Enter number (1-3), or 'n' for none: ").strip().lower()
+            if user_input in ['1', '2', '3']:
+                chosen_index = int(user_input) - 1
+                if chosen_index < len(current_guesses):
+                    chosen_word = current_guesses[chosen_index]
+                    print(f"Great! The word is '{chosen_word}'.")
+                    guesses.append(chosen_word)
+                    return guesses
                 print(f"Invalid input: only {len(current_guesses)} suggestion(s) shown.")
-                return self._autoComplete_recursive(prefix, guesses)
 
-        elif user_input == 'n':
-            new_prefix = input("Enter more letters to refine your guess (or just press Enter to stop): ").strip().lower()
-            if not new_prefix:
-                print("Stopping round.")
-                return guesses
-            return self._autoComplete_recursive(prefix + new_prefix, guesses)
+            elif user_input == 'n':
+                new_prefix = input("Enter more letters to refine your guess (or just press Enter to stop): ").strip().lower()
+                if not new_prefix:
+                    print("Stopping round.")
+                    return guesses
+                current_guesses = cursor.extend(new_prefix).top(3)
 
-        else:
-            print("Invalid input, try again.")
-            return self._autoComplete_recursive(prefix, guesses)
+            else:
+                print("Invalid input, try again.")
 
     def _start_autoComplete_round(self):
         query = input("Enter initial prefix to start autocomplete: ").strip()
@@ -67,7 +90,7 @@ class TrieCommandHandler:
             print("Empty input. Try again.")
             return
 
-        guesses = self._autoComplete_recursive(query, [])
+        guesses = self._autoComplete_loop(query)
 
         if guesses:
             print("Round completed! Your guesses were:", guesses)
@@ -88,11 +111,18 @@ class TrieCommandHandler:
                 print(f"   {rank}: {guess}")
             print("-" * 50)
 
+    # "Did you mean" fallback: closest keywords within two edits of word
+    def suggest_words(self, word, max_edits=2, count=3):
+        suggestions = self.trie.fuzzy_search(word, max_edits, count)
+        if suggestions:
+            print("Did you mean: " + ', '.join(f"{match} ({freq})" for match, freq, _ in suggestions) + "?")
+
     # Main controller
     def command_prompt(self, function, repeat=False):
         if function == "construct_edit":
             if not repeat:
-                self.trie = Trie()
+                self.trie = PersistentTrie(normalize=self.normalize)
+                self.history = EditHistory(self.trie)
                 UI.construct_edit(show_empty_trie=True)
             else:
                 UI.construct_edit(show_empty_trie=False)
@@ -103,7 +133,8 @@ class TrieCommandHandler:
                     continue
 
                 if cmd == '+':
-                    if arg.isalpha():
+                    if is_keyword(arg):
+                        self.history.record(('+', arg))
                         self.trie.insert(arg)
                         print(f"Added '{arg}' to trie.")
                     elif arg:
@@ -112,8 +143,9 @@ class TrieCommandHandler:
                         print("Please provide a word to add.")
 
                 elif cmd == '-':
-                    if arg.isalpha():
+                    if is_keyword(arg):
                         if self.trie.search(arg):
+                            self.history.record(('-', arg))
                             self.trie.delete(arg)
                             print(f"Deleted '{arg}' from trie.")
                         else:
@@ -124,9 +156,14 @@ class TrieCommandHandler:
                         print("Please provide a word to delete.")
 
                 elif cmd == '?':
-                    if arg.isalpha():
+                    if is_keyword(arg):
                         found = self.trie.search(arg)
                         print(f'Keyword "{arg}" is {"present" if found else "not present"}.')
+                        forms = self.trie.surface_forms(arg) if found else []
+                        if len(forms) > 1:
+                            print("Spellings seen: " + ', '.join(f"{form} ({freq})" for form, freq in forms))
+                        if not found:
+                            self.suggest_words(arg)
                     elif arg:
                         print("Invalid input! Only letters allowed.")
                     else:
@@ -143,8 +180,9 @@ class TrieCommandHandler:
                 elif cmd == '~':
                     filename = input("Please enter input file: ").strip()
                     if filename:
-                        self.trie = Trie()
-                        self.trie.load_keywords_from_file(filename)
+                        self.history.record(('~', filename))
+                        self.trie.clear()
+                        self.trie.merge(shared_trie_cache.get(filename))
                     else:
                         print("No filename entered.")
 
@@ -166,8 +204,38 @@ class TrieCommandHandler:
                         else:
                             print("Invalid filename.")
 
+                elif cmd == '%':
+                    filename = input("Please enter snapshot filename: ").strip()
+                    if filename and self.is_valid_filename(filename):
+                        self.trie.save_snapshot(filename)
+                    else:
+                        print("Invalid filename.")
+
                 elif cmd == '#':
-                    self.trie.display()
+                    self.display_trie(arg)
+
+                elif cmd == '<':
+                    edit = self.history.undo()
+                    print(f"Undid: {describe_edit(edit)}." if edit else "Nothing to undo.")
+
+                elif cmd == '>':
+                    edit = self.history.redo()
+                    print(f"Redid: {describe_edit(edit)}." if edit else "Nothing to redo.")
+
+                elif cmd == '^':
+                    if arg:
+                        self.history.checkpoint(arg)
+                        print(f"Checkpoint '{arg}' saved.")
+                    elif self.history.checkpoints:
+                        print("Checkpoints: " + ', '.join(self.history.checkpoints))
+                    else:
+                        print("No checkpoints saved.")
+
+                elif cmd == '&':
+                    if self.history.restore_checkpoint(arg):
+                        print(f"Trie restored to checkpoint '{arg}'.")
+                    else:
+                        print(f"No checkpoint named '{arg}'.")
 
                 elif cmd == '!':
                     UI.construct_edit(show_empty_trie=False)
@@ -190,22 +258,26 @@ class TrieCommandHandler:
                 if cmd == '~':
                     filename = input("Please enter input file: ").strip()
                     if filename:
-                        self.trie.load_keywords_from_file(filename)
+                        self.trie.merge(shared_trie_cache.get(filename))
                     else:
                         print("No filename entered.")
 
                 elif cmd == '#':
-                    self.trie.display()
+                    self.display_trie(arg)
 
                 elif cmd == '$':
                     arg = input("Please enter input word: ").strip()
-                    print(', '.join(f"{word} ({freq})" for word, freq in self.trie.get_words_with_prefix(arg)))
+                    print(', '.join(f"{word} ({freq})" for word, freq in self.trie.top_k(arg, 50)))
 
                 elif cmd == '?':
                     arg = input("Please enter input word: ").strip()
                     if arg:
                         result = self.trie.find_best_match(arg)
-                        print(f'Restored word: {result}' if result else "No matching word found.")
+                        if result:
+                            print(f'Restored word: {result}')
+                        else:
+                            print("No matching word found.")
+                            self.suggest_words(arg)
                     else:
                         print("Please provide a pattern to match.")
 
@@ -219,6 +291,24 @@ class TrieCommandHandler:
                     word_array = self.trie.separate_words(arg)
                     print(self.trie.loop_Sentence(word_array))
 
+                elif cmd == '>':
+                    input_file = input("Please enter text file to restore: ").strip()
+                    output_file = input("Please enter output file: ").strip()
+                    if not input_file or not output_file:
+                        print("No filename entered.")
+                    elif not os.path.exists(input_file):
+                        print(f"File '{input_file}' not found.")
+                    else:
+                        stats = restore_file(self.trie, input_file, output_file)
+                        print_restore_report(stats)
+
+                elif cmd == '%':
+                    stats = self.trie.query_cache.stats()
+                    print(f"Query cache: {stats['size']}/{stats['maxsize']} entries, "
+                          f"{stats['hits']} hits, {stats['misses']} misses "
+                          f"({stats['hit_rate']:.1%} hit rate), {stats['evictions']} evictions, "
+                          f"{stats['invalidations']} invalidations")
+
                 elif cmd == '!':
                     self.command_prompt("predict_restore")
                     return
@@ -238,7 +328,7 @@ class TrieCommandHandler:
                 if cmd == '~':
                     filename = input("Please enter input file: ").strip()
                     if filename:
-                        self.trie.load_keywords_from_file(filename)
+                        self.trie.merge(shared_trie_cache.get(filename))
                     else:
                         print("No filename entered.")
 
@@ -272,12 +362,12 @@ class TrieCommandHandler:
                 if cmd == '~':
                     filename = input("Please enter input file: ").strip()
                     if filename:
-                        self.trie.load_keywords_from_file(filename)
+                        self.trie.merge(shared_trie_cache.get(filename))
                     else:
                         print("No filename entered.")
 
                 elif cmd == '#':
-                    self.trie.display()
+                    self.display_trie()
 
                 elif cmd == '1':
                     self._start_autoComplete_round()
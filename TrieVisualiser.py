@@ -157,15 +157,17 @@ class TrieVisualizer:
 
 
     def get_longest_path(self):
-        def dfs(node, path):
-            nonlocal longest_path
-            if node.is_end_of_word and len(path) > len(longest_path):
-                longest_path = path[:]
-            for char, child in node.children.items():
-                path.append(char)
-                dfs(child, path)
-                path.pop()
-
+        # Explicit-stack DFS over a shared path buffer; the word is only copied
+        # when a longer one is found
         longest_path = []
-        dfs(self.trie.root, [])
+        path = []
+        stack = [(self.trie.root, '', 0)]
+        while stack:
+            node, char, depth = stack.pop()
+            if depth:
+                del path[depth - 1:]
+                path.append(char)
+            if node.is_end_of_word and depth > len(longest_path):
+                longest_path = path[:]
+            stack.extend((child, ch, depth + 1) for ch, child in reversed(node.children.items()))
         return ''.join(longest_path)
@@ -4,40 +4,40 @@ class AutoCompleteGame:
         self.UI = ui_module  # expects UI.Game_UI() method
         self.recent_rounds = []
 
-    def _autoComplete_recursive(self, prefix, guesses):
-        suggestions = self.trie.get_words_with_prefix(prefix)
-        if not suggestions:
-            print("No more suggestions. Ending round.")
-            return guesses
+    def _autoComplete_loop(self, prefix):
+        # One round: a cursor follows the prefix, so each refinement only walks the new letters
+        guesses = []
+        cursor = self.trie.completion_cursor(prefix)
+        current_guesses = cursor.top(3)
+        while True:
+            if not current_guesses:
+                print("No more suggestions. Ending round.")
+                return guesses
 
-        # Take up to 3 suggestions to show
-        current_guesses = suggestions[:3]
-        self.UI.Game_UI(current_guesses)
+            # Show up to 3 suggestions
+            self.UI.Game_UI(current_guesses)
 
-        # Ask user if any guess is correct
-        user_input = input("Is the word one of these? Enter number (1-3), or 'n' for none: ").strip().lower()
-        if user_input in ['1', '2', '3']:
-            chosen_index = int(user_input) - 1
-            if chosen_index < len(current_guesses):
-                chosen_word = current_guesses[chosen_index]
-                print(f"Great! The word is '{chosen_word}'.")
-                guesses.append(chosen_word)
-                return guesses
-            else:
+            # Ask user if any guess is correct
+            user_input = input("Is the word one of these? Enter number (1-3), or 'n' for none: ").strip().lower()
+            if user_input in ['1', '2', '3']:
+                chosen_index = int(user_input) - 1
+                if chosen_index < len(current_guesses):
+                    chosen_word = current_guesses[chosen_index]
+                    print(f"Great! The word is '{chosen_word}'.")
+                    guesses.append(chosen_word)
+                    return guesses
                 print(f"Invalid input: only {len(current_guesses)} suggestion(s) shown.")
-                return self._autoComplete_recursive(prefix, guesses)
 
-        elif user_input == 'n':
-            # User says none matched, ask for next prefix to narrow down
-            new_prefix = input("Enter more letters to refine your guess (or just press Enter to stop): ").strip().lower()
-            if not new_prefix:
-                print("Stopping round.")
-                return guesses
-            return self._autoComplete_recursive(prefix + new_prefix, guesses)
+            elif user_input == 'n':
+                # User says none matched, ask for more letters to narrow down
+                new_prefix = input("Enter more letters to refine your guess (or just press Enter to stop): ").strip().lower()
+                if not new_prefix:
+                    print("Stopping round.")
+                    return guesses
+                current_guesses = cursor.extend(new_prefix).top(3)
 
-        else:
-            print("Invalid input, try again.")
-            return self._autoComplete_recursive(prefix, guesses)
+            else:
+                print("Invalid input, try again.")
 
     def _start_autoComplete_round(self):
         query = input("Enter initial prefix to start autocomplete: ").strip()
@@ -45,7 +45,7 @@ class AutoCompleteGame:
             print("Empty input. Try again.")
             return
 
-        guesses = self._autoComplete_recursive(query, [])
+        guesses = self._autoComplete_loop(query)
 
         if guesses:
             print("Round completed! Your guesses were:", guesses)
@@ -0,0 +1,251 @@
+import sys
+from array import array
+
+from trie import Trie
+
+NO_NODE = -1
+
+# ----------------------- Compact Trie Class -----------------------
+# Array-backed alternative to Trie. Nodes are integer indices into parallel
+# arrays (struct-of-arrays) instead of TrieNode objects, so each node costs a
+# few bytes of buffer rather than a Python object plus a children dict.
+# Children are kept as a first-child / next-sibling linked list in insertion
+# order, so traversals return words in the same order as Trie.
+class CompactTrie:
+    __slots__ = ('first_child', 'next_sibling', 'edge_char', 'is_end', 'frequency', '_free')
+    root = 0
+
+    def __init__(self):
+        self.first_child = array('i')   # index of first child, NO_NODE if leaf
+        self.next_sibling = array('i')  # index of next sibling, NO_NODE if last
+        self.edge_char = array('I')     # code point of the edge leading into the node
+        self.is_end = array('B')        # 1 if the node ends a word
+        self.frequency = array('q')     # word frequency for end-of-word nodes
+        self._free = []                 # indices of deleted nodes, reused on insert
+        self._new_node(0)               # root is always node 0
+
+    # Allocate a node, reusing a freed slot if there is one
+    def _new_node(self, code):
+        if self._free:
+            idx = self._free.pop()
+            self.first_child[idx] = NO_NODE
+            self.next_sibling[idx] = NO_NODE
+            self.edge_char[idx] = code
+            self.is_end[idx] = 0
+            self.frequency[idx] = 0
+            return idx
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.edge_char.append(code)
+        self.is_end.append(0)
+        self.frequency.append(0)
+        return len(self.edge_char) - 1
+
+    # Find the child of node along the edge 'code', NO_NODE if absent
+    def _child(self, node, code):
+        child = self.first_child[node]
+        while child != NO_NODE:
+            if self.edge_char[child] == code:
+                return child
+            child = self.next_sibling[child]
+        return NO_NODE
+
+    # Child indices of node in insertion order
+    def _children(self, node):
+        children = []
+        child = self.first_child[node]
+        while child != NO_NODE:
+            children.append(child)
+            child = self.next_sibling[child]
+        return children
+
+    # Walk to the node for a plain (wildcard-free) prefix
+    def _find_node(self, prefix):
+        node = self.root
+        for ch in prefix:
+            node = self._child(node, ord(ch))
+            if node == NO_NODE:
+                return NO_NODE
+        return node
+
+    # Insert a word and update frequency (count occurrences in a single path walk)
+    def insert(self, word, count=1):
+        if count <= 0:
+            return
+        node = self.root
+        for ch in word:
+            code = ord(ch)
+            child = self.first_child[node]
+            last = NO_NODE
+            while child != NO_NODE and self.edge_char[child] != code:
+                last = child
+                child = self.next_sibling[child]
+            if child == NO_NODE:
+                child = self._new_node(code)
+                if last == NO_NODE:
+                    self.first_child[node] = child
+                else:
+                    self.next_sibling[last] = child
+            node = child
+        if self.is_end[node]:
+            self.frequency[node] += count
+        else:
+            self.is_end[node] = 1
+            self.frequency[node] = count
+
+    # Insert many (word, freq) pairs, one path walk per pair
+    def insert_many(self, words_with_freq):
+        for word, freq in words_with_freq:
+            self.insert(word, freq)
+
+    # Delete one occurrence of a word, pruning nodes that no longer lead anywhere
+    def delete(self, word):
+        path = [self.root]
+        node = self.root
+        for ch in word:
+            node = self._child(node, ord(ch))
+            if node == NO_NODE:
+                return
+            path.append(node)
+        if not self.is_end[node]:
+            return
+        self.frequency[node] -= 1
+        if self.frequency[node] > 0:
+            return
+        self.is_end[node] = 0
+        self.frequency[node] = 0
+
+        # Unlink childless, non-word nodes from the bottom of the path upwards
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if self.is_end[node] or self.first_child[node] != NO_NODE:
+                break
+            parent = path[depth - 1]
+            child = self.first_child[parent]
+            if child == node:
+                self.first_child[parent] = self.next_sibling[node]
+            else:
+                while self.next_sibling[child] != node:
+                    child = self.next_sibling[child]
+                self.next_sibling[child] = self.next_sibling[node]
+            self.next_sibling[node] = NO_NODE
+            self._free.append(node)
+
+    # Search for a word in the trie
+    def search(self, word):
+        node = self._find_node(word)
+        return node != NO_NODE and bool(self.is_end[node])
+
+    # Return all words and their frequencies
+    def get_all_words_with_freq(self, prefix='', frequency=True):
+        start = self._find_node(prefix)
+        if start == NO_NODE:
+            return []
+
+        words = []
+        buffer = list(prefix)
+        base = len(buffer)
+        stack = [(start, base)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > base:
+                del buffer[depth - 1:]
+                buffer.append(chr(self.edge_char[node]))
+            if self.is_end[node]:
+                word = ''.join(buffer)
+                words.append((word, self.frequency[node]) if frequency else word)
+            for child in reversed(self._children(node)):
+                stack.append((child, depth + 1))
+        return words
+
+    # Get predictions with support for wildcards '*'
+    def get_words_with_prefix(self, prefix, max_results=50):
+        results = []
+        buffer = []
+        stack = [(self.root, 0, 0)]
+        while stack and len(results) < max_results:
+            node, index, depth = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(chr(self.edge_char[node]))
+
+            if index == len(prefix):
+                if self.is_end[node]:
+                    results.append((''.join(buffer), self.frequency[node]))
+                for child in reversed(self._children(node)):
+                    stack.append((child, index, depth + 1))
+                continue
+
+            ch = prefix[index]
+            if ch == '*':
+                for child in reversed(self._children(node)):
+                    stack.append((child, index + 1, depth + 1))
+            else:
+                child = self._child(node, ord(ch))
+                if child != NO_NODE:
+                    stack.append((child, index + 1, depth + 1))
+        return results
+
+    # Restore a pattern to its most frequent matching word ('*' matches one character)
+    def find_best_match(self, pattern):
+        best_word, best_freq = "", -1
+        buffer = []
+        stack = [(self.root, 0)]
+        while stack:
+            node, index = stack.pop()
+            if index:
+                del buffer[index - 1:]
+                buffer.append(chr(self.edge_char[node]))
+
+            if index == len(pattern):
+                if self.is_end[node] and self.frequency[node] > best_freq:
+                    best_word, best_freq = ''.join(buffer), self.frequency[node]
+                continue
+
+            ch = pattern[index]
+            if ch == '*':
+                for child in reversed(self._children(node)):
+                    stack.append((child, index + 1))
+            else:
+                child = self._child(node, ord(ch))
+                if child != NO_NODE:
+                    stack.append((child, index + 1))
+        return best_word if best_freq > 0 else None
+
+    # Load keywords from file and populate the trie
+    load_keywords_from_file = Trie.load_keywords_from_file
+
+    # Save Keywords to File
+    save_keywords_to_file = Trie.save_keywords_to_file
+
+    # Number of live nodes (including the root)
+    def node_count(self):
+        return len(self.edge_char) - len(self._free)
+
+    # Bytes of array storage per live node
+    def bytes_per_node(self):
+        arrays = (self.first_child, self.next_sibling, self.edge_char, self.is_end, self.frequency)
+        total = sum(a.buffer_info()[1] * a.itemsize for a in arrays)
+        return total / self.node_count()
+
+    # Build a compact copy of an existing Trie
+    @classmethod
+    def from_trie(cls, trie):
+        compact = cls()
+        compact.insert_many(trie.get_all_words_with_freq())
+        return compact
+
+
+# Approximate bytes per node of an object-based Trie (node object, its __dict__ and children dict)
+def trie_bytes_per_node(trie):
+    total = 0
+    count = 0
+    stack = [trie.root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        total += sys.getsizeof(node) + sys.getsizeof(node.children)
+        if hasattr(node, '__dict__'):
+            total += sys.getsizeof(node.__dict__)
+        stack.extend(node.children.values())
+    return total / count
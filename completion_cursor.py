@@ -0,0 +1,86 @@
+# ----------------------------------------
+# completion_cursor.py
+# Resumable prefix cursor for ranked completions
+# ----------------------------------------
+#
+# A cursor remembers the trie nodes its prefix leads to, so typing more
+# characters only walks the new ones instead of starting again from the root.
+# '*' in the prefix matches any one character, in which case the cursor holds
+# every node the prefix can reach.
+
+import heapq
+from itertools import islice
+
+
+# ----------------------- Completion Cursor Class -----------------------
+class CompletionCursor:
+    def __init__(self, trie, prefix=''):
+        self.trie = trie
+        self.prefix = ''
+        self.frontiers = [[(trie.root, '')]]  # frontiers[i]: (node, path) reached by prefix[:i]
+        self.version = trie.version
+        self.extend(prefix)
+
+    # (node, path) pairs the current prefix leads to; empty if it matches nothing
+    @property
+    def nodes(self):
+        if self.version != self.trie.version:
+            self._reset()
+        return self.frontiers[-1]
+
+    # Walk the prefix again from the root after the trie changed (nodes may have been pruned)
+    def _reset(self):
+        prefix = self.prefix
+        self.prefix = ''
+        self.frontiers = [[(self.trie.root, '')]]
+        self.version = self.trie.version
+        self.extend(prefix)
+
+    # Add characters to the prefix, walking only from the current nodes
+    def extend(self, chars):
+        if self.version != self.trie.version:
+            self._reset()
+        for ch in self.trie._key(chars):
+            frontier = []
+            for node, path in self.frontiers[-1]:
+                if ch == '*':
+                    for next_ch, child in node.children.items():
+                        frontier.append((child, path + next_ch))
+                else:
+                    child = node.children.get(ch)
+                    if child is not None:
+                        frontier.append((child, path + ch))
+            self.frontiers.append(frontier)
+            self.prefix += ch
+        return self
+
+    # Remove the last count characters of the prefix
+    def back(self, count=1):
+        count = min(count, len(self.prefix))
+        if count:
+            del self.frontiers[-count:]
+            self.prefix = self.prefix[:-count]
+        return self
+
+    # Yield (word, freq) completions of the prefix, most frequent first (ties
+    # alphabetically), computed only as far as they are consumed. Best-first on
+    # the subtree maxima, so a branch is expanded only when it can hold the next word.
+    def suggestions(self):
+        # Heap entries: (-priority, path, is_subtree, node). A subtree entry is keyed
+        # by its max_freq, which bounds every word below it.
+        heap = [(-node.max_freq, path, True, node) for node, path in self.nodes if node.max_freq > 0]
+        heapq.heapify(heap)
+        while heap:
+            neg_freq, path, is_subtree, node = heapq.heappop(heap)
+            if not is_subtree:
+                yield path, -neg_freq
+                continue
+            if node.is_end_of_word:
+                heapq.heappush(heap, (-node.frequency, path, False, node))
+            for ch, child in node.children.items():
+                if child.max_freq > 0:
+                    heapq.heappush(heap, (-child.max_freq, path + ch, True, child))
+
+    # The k best completions of the prefix
+    def top(self, k=3):
+        return list(islice(self.suggestions(), k)) if k > 0 else []
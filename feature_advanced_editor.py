@@ -6,6 +6,11 @@
 
 from feature_base import FeatureBase
 from user_interface import UserInterface
+from trie_merge import merge_files
+from trie_cache import shared_trie_cache
+from keyword_io import iter_rename_pairs
+from trie_journal import EditJournal
+from persistent_trie import PersistentTrie, EditHistory, describe_edit
 import os
 
 class AdvancedTrieFeature(FeatureBase):
@@ -63,23 +68,22 @@ class AdvancedTrieFeature(FeatureBase):
 
     def load_and_merge_files(self, arg):
         # Parse filenames and check format
-        if ',' not in arg:
-            print("Invalid format. Use: ~file1.txt,file2.txt")
+        files = [name.strip() for name in arg.split(',') if name.strip()]
+        if len(files) < 2:
+            print("Invalid format. Use: ~file1.txt,file2.txt[,file3.txt,...]")
             return
         
-        file1, file2 = map(str.strip, arg.split(',', 1))
-        
         # Check file existence
-        if not os.path.exists(file1) or not os.path.exists(file2):
-            print(f"One or both files '{file1}', '{file2}' do not exist.")
+        missing = [name for name in files if not os.path.exists(name)]
+        if missing:
+            print(f"File(s) {', '.join(repr(name) for name in missing)} do not exist.")
             return
         
-        print(f"Merging tries from '{file1}' and '{file2}'...")
+        print(f"Merging tries from {len(files)} files: {', '.join(files)}...")
 
-        # Reset and load both Tries
-        self.trie = self.trie_class()  # Reset current trie
-        self.trie.load_keywords_from_file(file1)
-        self.trie.load_keywords_from_file(file2)
+        # Build one trie per file in parallel and merge them pairwise
+        self.trie = merge_files(files)
+        print(f"Merged {self.trie.count_prefix()} distinct keywords.")
         
         print("Merge complete. Displaying merged trie:")
         self.trie.display()
@@ -107,11 +111,9 @@ class AdvancedTrieFeature(FeatureBase):
             print(f"File '{filename}' not found.")
             return
         
-        temp_trie = self.trie_class()
-        temp_trie.load_keywords_from_file(filename)
+        temp_trie = shared_trie_cache.get(filename, self.trie_class)
         
-        all_words = temp_trie.get_all_words_with_freq()
-        if not all_words:
+        if not temp_trie.root.word_count:
             print(f"No keywords found in '{filename}'.")
             return
         
@@ -127,8 +129,8 @@ class AdvancedTrieFeature(FeatureBase):
             except ValueError:
                 print("Invalid number. Please enter a valid integer.")
         
-        # Sort by frequency descending
-        top_n_keywords = sorted(all_words, key=lambda x: x[1], reverse=True)[:top_n]
+        # Read the highest frequencies straight off the trie's frequency index
+        top_n_keywords = temp_trie.most_frequent(top_n)
         
         print(f"\nTop {top_n} keywords by frequency:")
         for word, freq in top_n_keywords:
@@ -143,12 +145,15 @@ class AdvancedTrieFeature(FeatureBase):
             print(f"File '{filename}' not found.")
             return
         
-        self.trie = self.trie_class()
-        self.trie.load_keywords_from_file(filename)
+        self.trie = PersistentTrie()
+        self.trie.load_file(filename)  # includes edits journaled since the last save
+        history = EditHistory(self.trie)
         
         while True:
-            print("Enter +keyword to add (e.g., +cat): ", end='')
+            print("Enter +keyword to add (e.g., +cat, < to undo, > to redo): ", end='')
             user_input = input().strip()
+            if self.undo_redo(history, user_input):
+                continue
             if not user_input.startswith('+') or len(user_input) <= 1:
                 print("Invalid format. Use: +keyword")
                 continue
@@ -158,6 +163,7 @@ class AdvancedTrieFeature(FeatureBase):
                 print("Keyword cannot be empty.")
                 continue
             
+            history.record(('+', keyword))
             self.trie.insert(keyword)
             print(f"'{keyword}' has been added to the Trie (frequency increased by 1).")
             
@@ -173,8 +179,7 @@ class AdvancedTrieFeature(FeatureBase):
         print("\nDo you want to update and save the TXT file? (yes/no): ", end='')
         save_choice = input().strip().lower()
         if save_choice == 'yes':
-            self.trie.save_keywords_to_file(filename)
-            print(f"Trie has been saved to '{filename}'.")
+            self.save_edits(filename, history.edits())
         else:
             print("Changes were not saved.")
     
@@ -187,12 +192,15 @@ class AdvancedTrieFeature(FeatureBase):
             print(f"File '{filename}' not found.")
             return
         
-        self.trie = self.trie_class()
-        self.trie.load_keywords_from_file(filename)
+        self.trie = PersistentTrie()
+        self.trie.load_file(filename)  # includes edits journaled since the last save
+        history = EditHistory(self.trie)
         
         while True:
-            print("Enter -keyword to subtract (e.g., -cat): ", end='')
+            print("Enter -keyword to subtract (e.g., -cat, < to undo, > to redo): ", end='')
             user_input = input().strip()
+            if self.undo_redo(history, user_input):
+                continue
             if not user_input.startswith('-') or len(user_input) <= 1:
                 print("Invalid format. Use: -keyword")
                 continue
@@ -202,11 +210,11 @@ class AdvancedTrieFeature(FeatureBase):
                 print("Keyword cannot be empty.")
                 continue
             
-            all_words = dict(self.trie.get_all_words_with_freq())
-            if keyword not in all_words:
+            if not self.trie.search(keyword):
                 print(f"'{keyword}' not found in the Trie.")
                 continue
             
+            history.record(('-', keyword))
             self.trie.delete(keyword)
             print(f"One occurrence of '{keyword}' has been removed from the Trie.")
             
@@ -222,13 +230,38 @@ class AdvancedTrieFeature(FeatureBase):
         print("\nDo you want to update and save the TXT file? (yes/no): ", end='')
         save_choice = input().strip().lower()
         if save_choice == 'yes':
-            self.trie.save_keywords_to_file(filename)
-            print(f"Trie has been saved to '{filename}'.")
+            self.save_edits(filename, history.edits())
         else:
             print("Changes were not saved.")
 
+    def undo_redo(self, history, user_input):
+        # Handle '<' (undo) and '>' (redo) typed at an edit prompt; True if handled
+        if user_input == '<':
+            edit = history.undo()
+            print(f"Undid: {describe_edit(edit)}." if edit else "Nothing to undo.")
+        elif user_input == '>':
+            edit = history.redo()
+            print(f"Redid: {describe_edit(edit)}." if edit else "Nothing to redo.")
+        else:
+            return False
+        return True
+
+    def save_edits(self, filename, edits):
+        # Append the edits to the file's journal instead of rewriting the file;
+        # the journal is folded back into the file once it grows large
+        journal = EditJournal(filename)
+        journal.append(edits)
+        print(f"{len(edits)} edit(s) saved to '{journal.path}'.")
+        if journal.maybe_compact(self.trie):
+            print(f"Journal compacted into '{filename}'.")
+
     def replace_word(self, args):
-        # Replace old keyword with new one in the file
+        # Replace old keyword with new one in the file.
+        # With a rename file (^renames.txt of 'old,new' lines) every pair is applied in one pass.
+        if args and not os.path.exists(args):
+            print(f"Rename file '{args}' not found.")
+            return
+
         print("Enter filename to load the Trie from: ", end='')
         filename = input().strip()
         
@@ -236,65 +269,60 @@ class AdvancedTrieFeature(FeatureBase):
             print(f"File '{filename}' not found.")
             return
         
-        self.trie = self.trie_class()
-        self.trie.load_keywords_from_file(filename)
+        self.trie = PersistentTrie()
+        self.trie.load_file(filename)  # includes edits journaled since the last save
+        history = EditHistory(self.trie)
+
+        if args:
+            renamed = missing = 0
+            for old, new in iter_rename_pairs(args):
+                if self.trie.search(old):
+                    history.record(('=', old, new))
+                    self.trie.rename(old, new)
+                    renamed += 1
+                else:
+                    missing += 1
+            print(f"\n{renamed} keyword(s) renamed from '{args}' ({missing} not found in the Trie).")
         
-        while True:
+        while not args:
             # Step 1: Show current words
             print("\nCurrent keywords with frequencies:")
-            all_words = self.trie.get_all_words_with_freq()
-            for word, freq in sorted(all_words):
+            for word, freq in sorted(self.trie.get_all_words_with_freq()):
                 print(f"{word},{freq}")
             
-            print("\nEnter ^old,new to replace a word: ", end='')
+            print("\nEnter ^old,new to replace a word (< to undo, > to redo): ", end='')
             replace_input = input().strip()
+            if self.undo_redo(history, replace_input):
+                continue
             if not replace_input.startswith('^') or ',' not in replace_input:
                 print("Invalid format. Use: ^oldword,newword")
                 return
             
             old, new = map(str.strip, replace_input[1:].split(',', 1))
             
-            # Step 2: Find and replace word in the list
-            new_word_list = []
-            replaced = False
-            freq_to_add = 0
-            
-            for word, freq in all_words:
-                if word == old:
-                    freq_to_add = freq
-                    replaced = True
-                else:
-                    new_word_list.append((word, freq))
-            
-            if not replaced:
+            # Step 2: Move the frequency from old to new in place
+            if not self.trie.search(old):
                 print(f"'{old}' not found in current Trie.")
                 continue
+            history.record(('=', old, new))
+            freq_moved = self.trie.rename(old, new)
             
-            new_word_list.append((new, freq_to_add))
+            print(f"\n'{old}' has been replaced with '{new}' (with frequency {freq_moved}).")
             
-            # Step 3: Rebuild Trie
-            self.trie = self.trie_class()
-            for word, freq in new_word_list:
-                for _ in range(freq):
-                    self.trie.insert(word)
-            
-            print(f"\n'{old}' has been replaced with '{new}' (with frequency {freq_to_add}).")
-            
-            # Step 4: Show updated Trie
+            # Step 3: Show updated Trie
             print("\nUpdated Trie structure:")
             self.trie.display()
             
-            # Step 5: Ask if want to replace more
+            # Step 4: Ask if want to replace more
             print("\nDo you want to replace another keyword? (yes/no): ", end='')
             again = input().strip().lower()
             if again != 'yes':
                 break
-        
-        # Step 6: Ask to save
+
+        # Step 5: Ask to save
         print("\nDo you want to update and save the TXT file? (yes/no): ", end='')
         save_choice = input().strip().lower()
         if save_choice == 'yes':
-            self.trie.save_keywords_to_file(filename)
-            print(f"Trie has been saved to '{filename}'.")
+            self.save_edits(filename, history.edits())
         else:
             print("Changes were not saved.")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import heapq
+
+# ----------------------- Frequency Index Class -----------------------
+# Words bucketed by frequency, for top-N and frequency range queries.
+# Each bucket is an insertion-ordered set (dict with None values) and the
+# distinct frequencies are kept in a max-heap, so an update costs O(log F)
+# and queries walk the heap from the top, costing time proportional to what
+# they return. A frequency whose bucket empties stays in the heap until the
+# heap is rebuilt (lazy deletion); queries skip it.
+class FrequencyIndex:
+    def __init__(self, words_with_freq=()):
+        self.buckets = {}  # frequency -> {word: None}
+        for word, freq in words_with_freq:
+            bucket = self.buckets.get(freq)
+            if bucket is None:
+                bucket = self.buckets[freq] = {}
+            bucket[word] = None
+        self._rebuild_heap()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    # Heap of the live frequencies only (negated, heapq is a min-heap)
+    def _rebuild_heap(self):
+        self._heap = [-freq for freq in self.buckets]
+        heapq.heapify(self._heap)
+        self._in_heap = set(self.buckets)  # frequencies in the heap, live or stale
+
+    def _add(self, word, freq):
+        bucket = self.buckets.get(freq)
+        if bucket is None:
+            bucket = self.buckets[freq] = {}
+            if freq not in self._in_heap:
+                heapq.heappush(self._heap, -freq)
+                self._in_heap.add(freq)
+        bucket[word] = None
+
+    def _remove(self, word, freq):
+        bucket = self.buckets[freq]
+        del bucket[word]
+        if not bucket:
+            del self.buckets[freq]
+            # Drop the stale entries once they outnumber the live ones
+            if len(self._heap) > 2 * len(self.buckets) + 16:
+                self._rebuild_heap()
+
+    # Record that word's frequency changed from old to new (0 = not in the trie)
+    def update(self, word, old, new):
+        if old == new:
+            return
+        if old > 0:
+            self._remove(word, old)
+        if new > 0:
+            self._add(word, new)
+
+    # Yield the distinct frequencies in [lo, hi], highest first. The heap is
+    # walked in order without popping it: an entry's children become candidates
+    # once it is reached, and a subtree whose top is below lo is never entered.
+    def _iter_freqs(self, lo, hi):
+        heap = self._heap
+        if not heap:
+            return
+        candidates = [(heap[0], 0)]
+        while candidates:
+            neg_freq, i = heapq.heappop(candidates)
+            freq = -neg_freq
+            if freq < lo:
+                break
+            if (hi is None or freq <= hi) and freq in self.buckets:
+                yield freq
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap) and -heap[child] >= lo:
+                    heapq.heappush(candidates, (heap[child], child))
+
+    # Yield (word, freq) for frequencies in [lo, hi], highest frequency first.
+    # Words sharing a frequency come in the order they reached it.
+    def iter_between(self, lo=1, hi=None):
+        for freq in self._iter_freqs(lo, hi):
+            for word in self.buckets[freq]:
+                yield word, freq
+
+    # The n most frequent (word, freq) pairs
+    def most_frequent(self, n):
+        results = []
+        if n <= 0:
+            return results
+        for entry in self.iter_between():
+            results.append(entry)
+            if len(results) >= n:
+                break
+        return results
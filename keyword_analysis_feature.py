@@ -6,6 +6,8 @@
 
 from feature_base import FeatureBase
 from user_interface import UserInterface
+from trie_cache import shared_trie_cache
+from keyword_analytics import get_report
 import os
 
 class KeywordAnalysisFeature(FeatureBase):
@@ -39,6 +41,8 @@ class KeywordAnalysisFeature(FeatureBase):
 
             if command == '=':
                 self.compare_keywords(args)
+            elif command == '-':
+                self.diff_keywords(args)
             elif command == '>':
                 self.transfer_keyword(args)
             elif command == '#':
@@ -49,6 +53,8 @@ class KeywordAnalysisFeature(FeatureBase):
                 self.top_starting_letters(args)
             elif command == '$':
                 self.find_palindromes(args)
+            elif command == '&':
+                self.show_statistics(args)
             elif command == '!':
                 self.print_instructions()
             elif command == '\\':
@@ -69,17 +75,12 @@ class KeywordAnalysisFeature(FeatureBase):
             print(f"One or both files '{file1}', '{file2}' do not exist.")
             return
 
-        # Load both tries
-        trie1 = self.trie_class()
-        trie1.load_keywords_from_file(file1)
-        words1 = set(w for w, _ in trie1.get_all_words_with_freq())
+        # Load both tries (shared read-only copies from the cache)
+        trie1 = shared_trie_cache.get(file1, self.trie_class)
+        trie2 = shared_trie_cache.get(file2, self.trie_class)
 
-        trie2 = self.trie_class()
-        trie2.load_keywords_from_file(file2)
-        words2 = set(w for w, _ in trie2.get_all_words_with_freq())
-
-        # Find common keywords
-        common = words1.intersection(words2)
+        # Find common keywords by walking both tries together
+        common = [word for word, _ in trie1.intersection(trie2, stream=True)]
 
         if not common:
             print("No common keywords found.")
@@ -88,6 +89,30 @@ class KeywordAnalysisFeature(FeatureBase):
             for word in sorted(common):
                 print(f" - {word}")
     
+    # Show keywords that appear in only one of two files
+    def diff_keywords(self, arg):
+        if ',' not in arg:
+            print("Invalid format. Use: -file1.txt,file2.txt")
+            return
+
+        file1, file2 = map(str.strip, arg.split(',', 1))
+
+        if not os.path.exists(file1) or not os.path.exists(file2):
+            print(f"One or both files '{file1}', '{file2}' do not exist.")
+            return
+
+        trie1 = shared_trie_cache.get(file1, self.trie_class)
+        trie2 = shared_trie_cache.get(file2, self.trie_class)
+
+        for name, first, second in ((file1, trie1, trie2), (file2, trie2, trie1)):
+            only = sorted(first.difference(second, stream=True))
+            if not only:
+                print(f"\nNo keywords only in '{name}'.")
+            else:
+                print(f"\nKeywords only in '{name}':")
+                for word, freq in only:
+                    print(f" - {word} ({freq})")
+    
     # Transfer a keyword from one file to another
     def transfer_keyword(self, arg):
         if ',' not in arg:
@@ -102,8 +127,8 @@ class KeywordAnalysisFeature(FeatureBase):
         
         self.trie1 = self.trie_class()
         self.trie2 = self.trie_class()
-        self.trie1.load_keywords_from_file(file1)
-        self.trie2.load_keywords_from_file(file2)
+        self.trie1.load_file(file1)
+        self.trie2.load_file(file2)
         
         while True:
             print("Enter keyword to transfer from first file to second: ", end='')
@@ -140,82 +165,70 @@ class KeywordAnalysisFeature(FeatureBase):
         else:
             print("Changes were not saved.")
     
-    # Sort and display keywords from longest to shortest
-    def sort_keywords_by_length(self, filename):
+    # Load (or reuse) the trie for filename and its analytics report
+    def _get_report(self, filename):
         if not os.path.exists(filename):
             print(f"File '{filename}' not found.")
-            return
+            return None
+        return get_report(shared_trie_cache.get(filename, self.trie_class))
 
-        temp_trie = self.trie_class()
-        temp_trie.load_keywords_from_file(filename)
-        all_words = temp_trie.get_all_words_with_freq()
-        sorted_words = sorted(all_words, key=lambda x: (-len(x[0]), x[0]))
+    # Sort and display keywords from longest to shortest
+    def sort_keywords_by_length(self, filename):
+        report = self._get_report(filename)
+        if report is None:
+            return
 
         print("\nKeywords from longest to shortest:")
-        for word, freq in sorted_words:
+        for word, freq in report.words_by_length_desc():
             print(f" - {word} ({freq})")
     
     # Group and display keywords alphabetically
     def group_by_alphabet(self, filename):
-        if not os.path.exists(filename):
-            print(f"File '{filename}' not found.")
+        report = self._get_report(filename)
+        if report is None:
             return
         
-        temp_trie = self.trie_class()
-        temp_trie.load_keywords_from_file(filename)
-        all_words = temp_trie.get_all_words_with_freq()
-        
-        grouped = {}
-        for word, freq in all_words:
-            first_letter = word[0].upper()
-            if not first_letter.isalpha():
-                first_letter = '#'  # for non-alphabet characters
-            grouped.setdefault(first_letter, []).append((word, freq))
-        
         print(f"\nGrouped keywords in '{filename}':")
-        for letter in sorted(grouped.keys()):
+        for letter in sorted(report.by_letter.keys()):
             print(f"\n{letter}:")
-            for word, freq in sorted(grouped[letter]):
+            for word, freq in report.by_letter[letter]:
                 print(f"  - {word} ({freq})")
     
     # Show the top starting letters by frequency
     def top_starting_letters(self, filename):
-        if not os.path.exists(filename):
-            print(f"File '{filename}' not found.")
+        report = self._get_report(filename)
+        if report is None:
             return
         
-        temp_trie = self.trie_class()
-        temp_trie.load_keywords_from_file(filename)
-        all_words = temp_trie.get_all_words_with_freq()
-        
-        letter_counts = {}
-        for word, _ in all_words:
-            first_letter = word[0].upper()
-            if not first_letter.isalpha():
-                first_letter = '#'
-            letter_counts[first_letter] = letter_counts.get(first_letter, 0) + 1
-        
-        sorted_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
         print(f"\nTop starting letters in '{filename}':")
-        for letter, count in sorted_letters:
+        for letter, count in report.top_letters(5):
             print(f"  - {letter}: {count} words")
     
     # Display palindromic keywords from file
     def find_palindromes(self, filename):
-        if not os.path.exists(filename):
-            print(f"File '{filename}' not found.")
+        report = self._get_report(filename)
+        if report is None:
             return
         
-        temp_trie = self.trie_class()
-        temp_trie.load_keywords_from_file(filename)
-        all_words = temp_trie.get_all_words_with_freq()
-        
-        palindromes = [(word, freq) for word, freq in all_words if word == word[::-1] and len(word) > 1]
-        
-        if not palindromes:
+        if not report.palindromes:
             print(f"No palindromic keywords found in '{filename}'.")
         else:
             print(f"\nPalindromic keywords in '{filename}':")
-            for word, freq in sorted(palindromes):
-                print(f"  - {word} ({freq})")
\ No newline at end of file
+            for word, freq in report.palindromes:
+                print(f"  - {word} ({freq})")
+
+    # Show structural statistics of the trie built from file
+    def show_statistics(self, filename):
+        report = self._get_report(filename)
+        if report is None:
+            return
+
+        print(f"\nTrie statistics for '{filename}':")
+        print(f"  - Keywords: {report.word_count}")
+        print(f"  - Nodes: {report.node_count}")
+        print(f"  - Longest keyword: {report.max_depth} characters")
+        print(f"  - Average keyword length: {report.average_word_length():.2f}")
+        print(f"  - Average branching factor: {report.average_branching():.2f}")
+        print(f"  - Maximum branching factor: {report.max_branching}")
+        print("  - Keywords per length: " + ', '.join(
+            f"{length}: {len(report.by_length[length])}" for length in sorted(report.by_length)))
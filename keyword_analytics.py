@@ -0,0 +1,100 @@
+# ----------------------------------------
+# keyword_analytics.py
+# Single-pass keyword analytics for a trie
+# ----------------------------------------
+
+import weakref
+
+
+# Group key used by the keyword analysis commands: upper-cased first letter, '#' otherwise
+def first_letter_key(ch):
+    letter = ch.upper()
+    return letter if letter.isalpha() else '#'
+
+
+# ----------------------- Analytics Report Class -----------------------
+# Everything the keyword analysis commands show, computed by one DFS over the
+# trie with children visited in sorted order, so every word list below is
+# already in lexicographic order.
+class KeywordAnalyticsReport:
+    def __init__(self):
+        self.by_length = {}        # word length -> [(word, freq)] in lexicographic order
+        self.by_letter = {}        # first-letter key -> [(word, freq)] in lexicographic order
+        self.letter_counts = {}    # first-letter key -> number of words (from root aggregates)
+        self.palindromes = []      # [(word, freq)] with len(word) > 1, lexicographic order
+        self.word_count = 0
+        self.node_count = 0
+        self.internal_nodes = 0    # nodes with at least one child
+        self.edge_count = 0
+        self.max_branching = 0
+        self.max_depth = 0         # length of the longest word
+        self.total_word_length = 0
+
+    # Words from longest to shortest, ties in lexicographic order
+    def words_by_length_desc(self):
+        for length in sorted(self.by_length, reverse=True):
+            yield from self.by_length[length]
+
+    # The n most common first letters as (letter, count)
+    def top_letters(self, n=5):
+        return sorted(self.letter_counts.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def average_branching(self):
+        return self.edge_count / self.internal_nodes if self.internal_nodes else 0.0
+
+    def average_word_length(self):
+        return self.total_word_length / self.word_count if self.word_count else 0.0
+
+
+# Build the report for a trie in a single traversal
+def analyse_trie(trie):
+    report = KeywordAnalyticsReport()
+
+    # Starting-letter counts come straight from the root's subtree word counts
+    for ch, child in trie.root.children.items():
+        key = first_letter_key(ch)
+        report.letter_counts[key] = report.letter_counts.get(key, 0) + child.word_count
+
+    buffer = []
+    stack = [(trie.root, '', 0)]
+    while stack:
+        node, ch, depth = stack.pop()
+        if depth:
+            del buffer[depth - 1:]
+            buffer.append(ch)
+        report.node_count += 1
+
+        children = len(node.children)
+        if children:
+            report.internal_nodes += 1
+            report.edge_count += children
+            if children > report.max_branching:
+                report.max_branching = children
+
+        if node.is_end_of_word and depth:
+            word = ''.join(buffer)
+            entry = (word, node.frequency)
+            report.word_count += 1
+            report.total_word_length += depth
+            if depth > report.max_depth:
+                report.max_depth = depth
+            report.by_length.setdefault(depth, []).append(entry)
+            report.by_letter.setdefault(first_letter_key(word[0]), []).append(entry)
+            if depth > 1 and word == word[::-1]:
+                report.palindromes.append(entry)
+
+        stack.extend((child, next_ch, depth + 1) for next_ch, child in sorted(node.children.items(), reverse=True))
+    return report
+
+
+# Reports are remembered per trie until the trie changes (its version moves on)
+_reports = weakref.WeakKeyDictionary()
+
+
+def get_report(trie):
+    cached = _reports.get(trie)
+    if cached is not None and cached[0] == trie.version:
+        return cached[1]
+    report = analyse_trie(trie)
+    _reports[trie] = (trie.version, report)
+    return report
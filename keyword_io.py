@@ -0,0 +1,167 @@
+# ----------------------------------------
+# keyword_io.py
+# Shared reading/writing of 'word,freq' keyword files
+# ----------------------------------------
+#
+# Used by Trie, TrieIO and the other trie variants. Files are read in large
+# binary chunks, split on line boundaries and parsed into (word, freq)
+# batches, optionally by a pool of worker processes. gzip, bz2 and xz files
+# are detected from their magic bytes on read and from the file extension on
+# write. Nothing is printed; load/save return a stats dict instead.
+
+import bz2
+import gzip
+import lzma
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+
+DEFAULT_CHUNK_SIZE = 4 << 20  # bytes of (decompressed) text per parse batch
+
+_MAGIC = (
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+)
+_EXTENSIONS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+# Open a keyword file for binary reading, decompressing transparently
+def open_for_read(filename):
+    with open(filename, 'rb') as f:
+        head = f.read(6)
+    for magic, opener in _MAGIC:
+        if head.startswith(magic):
+            return opener(filename, 'rb')
+    return open(filename, 'rb')
+
+
+# Open a keyword file for binary writing, compressed if the extension asks for it
+def open_for_write(filename):
+    opener = _EXTENSIONS.get(os.path.splitext(filename)[1].lower(), open)
+    return opener(filename, 'wb')
+
+
+# Parse 'word,freq' lines into (word, freq) pairs. Lines without a comma are
+# skipped and an unreadable frequency counts as 1.
+def parse_keyword_lines(lines):
+    for line in lines:
+        line = line.strip()
+        if line and ',' in line:
+            word, freq_str = line.rsplit(',', 1)
+            try:
+                freq = int(freq_str)
+            except ValueError:
+                freq = 1
+            yield word, freq
+
+
+def _parse_chunk(data):
+    return list(parse_keyword_lines(data.decode('utf-8').splitlines()))
+
+
+# Yield raw chunks of about chunk_size bytes that end on a line boundary
+def _read_chunks(f, chunk_size):
+    leftover = b''
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        data = leftover + data
+        cut = data.rfind(b'\n') + 1
+        if cut == 0:
+            leftover = data
+            continue
+        leftover = data[cut:]
+        yield data[:cut]
+    if leftover:
+        yield leftover
+
+
+# Yield lists of (word, freq) pairs parsed from filename.
+# With workers > 1, chunks are parsed in a process pool (at most 2 * workers
+# chunks in flight) and batches come back in file order.
+# 'stats' (optional dict) collects line and byte counts as the file is read.
+def iter_keyword_batches(filename, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, stats=None):
+    stats = stats if stats is not None else {}
+    stats.setdefault('lines', 0)
+    stats.setdefault('bytes', 0)
+
+    def _counted(chunks):
+        for chunk in chunks:
+            stats['lines'] += chunk.count(b'\n') + (not chunk.endswith(b'\n'))
+            stats['bytes'] += len(chunk)
+            yield chunk
+
+    with open_for_read(filename) as f:
+        chunks = _counted(_read_chunks(f, chunk_size))
+        if workers <= 1:
+            for chunk in chunks:
+                yield _parse_chunk(chunk)
+            return
+
+        with Pool(workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_parse_chunk, (chunk,)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+
+# Insert every keyword of filename into trie (anything with insert_many).
+# Returns {'lines', 'bytes', 'keywords', 'seconds'}; raises OSError if unreadable.
+def load_keywords(trie, filename, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    start = time.perf_counter()
+    stats = {'lines': 0, 'bytes': 0, 'keywords': 0}
+    for batch in iter_keyword_batches(filename, chunk_size, workers, stats):
+        trie.insert_many(batch)
+        stats['keywords'] += len(batch)
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+# Yield (old, new) pairs from a rename file of 'old,new' lines, in file order.
+# Lines without a comma or with an empty side are skipped.
+def iter_rename_pairs(filename):
+    with open_for_read(filename) as f:
+        for raw in f:
+            line = raw.decode('utf-8').strip()
+            if ',' not in line:
+                continue
+            old, new = (part.strip() for part in line.split(',', 1))
+            if old and new:
+                yield old, new
+
+
+# Write every (word, freq) of trie to filename, sorted by word unless sort=False.
+# A normalising Trie writes each spelling it has seen rather than its keys, so
+# loading the file back gives the same words and spellings.
+# Returns {'lines', 'bytes', 'seconds'}; raises OSError if unwritable.
+def save_keywords(trie, filename, sort=True):
+    start = time.perf_counter()
+    spellings = getattr(trie, 'get_all_spellings_with_freq', None)
+    words = spellings() if spellings else trie.get_all_words_with_freq()
+    if sort:
+        words.sort()
+
+    stats = {'lines': 0, 'bytes': 0}
+    with open_for_write(filename) as f:
+        batch = []
+        for word, freq in words:
+            batch.append(f"{word},{freq}\n")
+            if len(batch) >= 10000:
+                stats['bytes'] += f.write(''.join(batch).encode('utf-8'))
+                stats['lines'] += len(batch)
+                batch = []
+        if batch:
+            stats['bytes'] += f.write(''.join(batch).encode('utf-8'))
+            stats['lines'] += len(batch)
+    stats['seconds'] = time.perf_counter() - start
+    return stats
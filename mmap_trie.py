@@ -0,0 +1,317 @@
+# ----------------------------------------
+# mmap_trie.py
+# Read-only trie served straight from a memory-mapped file
+# ----------------------------------------
+#
+# Layout (native byte order, recorded in the header):
+#   header   magic b'TRIEMMAP', format version (uint16), big-endian flag (uint16),
+#            normalisation mode (uint32), node count (uint64), spelling count (uint64)
+#   body     frequency[n] (int64), max_freq[n] (int64),
+#            first_child[n] (uint32), child_count[n] (uint32),
+#            edge_char[n] (uint32), height[n] (uint32)
+#   spellings  spelling_node[s] (uint32, ascending), spelling_end[s] (uint32),
+#              UTF-8 text of the s spellings back to back
+#
+# A trie written from a normalising Trie records its mode, and queries are
+# normalised the same way. Words whose most frequent spelling differs from the
+# stored key get an entry in the spelling table, which find_best_match returns
+# instead of the key. Version 1 files (no mode, no spellings) are still read.
+#
+# Nodes are numbered in breadth-first order so each node's children are a
+# contiguous run starting at first_child, kept in insertion order. Queries
+# read the arrays through memoryviews on the mmap, so no per-node Python
+# objects are created and every process opening the file shares the same
+# page-cached copy.
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from text_normalize import get_normalizer
+from trie import Trie, _preferred_spelling
+
+MMAP_MAGIC = b'TRIEMMAP'
+MMAP_VERSION = 2
+_HEADER = struct.Struct('<8sHHIQQ')
+_NORMALIZATIONS = (None, 'nfkc', 'casefold', 'nfkc_casefold')  # header code -> mode
+
+
+# Check whether a file starts with the mmap trie magic
+def is_mmap_trie_file(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(MMAP_MAGIC)) == MMAP_MAGIC
+    except OSError:
+        return False
+
+
+# Write a Trie in the memory-mappable layout
+def write_mmap_trie(trie, filename):
+    mode = getattr(trie, 'normalization', None)
+    if mode == 'none':
+        mode = None
+    if mode not in _NORMALIZATIONS:
+        raise ValueError(f"normalisation {mode!r} cannot be stored in a memory-mapped trie")
+    frequency = array('q')
+    max_freq = array('q')
+    first_child = array('I')
+    child_count = array('I')
+    edge_char = array('I')
+    height = array('I')
+    spelling_node = array('I')
+    spelling_end = array('I')
+    spellings = []
+
+    order = [(trie.root, '')]
+    i = 0
+    while i < len(order):
+        node, ch = order[i]
+        frequency.append(node.frequency if node.is_end_of_word else 0)
+        max_freq.append(node.max_freq)
+        first_child.append(len(order))
+        child_count.append(len(node.children))
+        edge_char.append(ord(ch) if ch else 0)
+        height.append(node.height)
+        spelling = _preferred_spelling(node) if node.is_end_of_word else None
+        if spelling is not None:
+            spellings.append(spelling.encode('utf-8'))
+            spelling_node.append(i)
+            spelling_end.append((spelling_end[-1] if spelling_end else 0) + len(spellings[-1]))
+        order.extend((child, next_ch) for next_ch, child in node.children.items())
+        i += 1
+
+    with open(filename, 'wb') as f:
+        f.write(_HEADER.pack(MMAP_MAGIC, MMAP_VERSION, sys.byteorder == 'big',
+                             _NORMALIZATIONS.index(mode), len(order), len(spellings)))
+        for arr in (frequency, max_freq, first_child, child_count, edge_char, height,
+                    spelling_node, spelling_end):
+            arr.tofile(f)
+        f.write(b''.join(spellings))
+    return len(order)
+
+
+# ----------------------- Mmap Trie Class -----------------------
+class MmapTrie:
+    # Sentence restoration only needs find_best_match / get_all_words_with_freq
+    separate_words = Trie.separate_words
+    loop_Sentence = Trie.loop_Sentence
+    loop_Sentence_AllMatches = Trie.loop_Sentence_AllMatches
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{filename}' is empty")
+
+        magic, version, big_endian, mode, count, spelling_count = _HEADER.unpack_from(self._mm)
+        if magic != MMAP_MAGIC:
+            self.close()
+            raise ValueError(f"'{filename}' is not a memory-mapped trie file")
+        if version not in (1, MMAP_VERSION):
+            self.close()
+            raise ValueError(f"unsupported mmap trie version {version}")
+        if bool(big_endian) != (sys.byteorder == 'big'):
+            self.close()
+            raise ValueError("mmap trie was written on a machine with a different byte order")
+        if mode >= len(_NORMALIZATIONS):
+            self.close()
+            raise ValueError(f"unknown normalisation mode {mode} in '{filename}'")
+        tables_size = _HEADER.size + count * 32 + spelling_count * 8
+        if len(self._mm) < tables_size:
+            self.close()
+            raise ValueError(f"'{filename}' is truncated")
+
+        view = memoryview(self._mm)
+        offset = _HEADER.size
+        arrays = []
+        for fmt, size, n in (('q', 8, count), ('q', 8, count), ('I', 4, count), ('I', 4, count),
+                             ('I', 4, count), ('I', 4, count),
+                             ('I', 4, spelling_count), ('I', 4, spelling_count)):
+            arrays.append(view[offset:offset + n * size].cast(fmt))
+            offset += n * size
+        text_size = arrays[-1][-1] if spelling_count else 0
+        arrays.append(view[offset:offset + text_size])
+        view.release()
+        (self.frequency, self.max_freq, self.first_child, self.child_count, self.edge_char,
+         self.height, self.spelling_node, self.spelling_end, self.spelling_text) = arrays
+        if len(self._mm) != tables_size + text_size:
+            self.close()
+            raise ValueError(f"'{filename}' is truncated")
+        self.normalization = _NORMALIZATIONS[mode]
+        self._normalize = get_normalizer(self.normalization)
+        self.node_count = count
+        self.last_match_visits = 0
+
+    def close(self):
+        for name in ('frequency', 'max_freq', 'first_child', 'child_count', 'edge_char', 'height',
+                     'spelling_node', 'spelling_end', 'spelling_text'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # The key a word is stored under: the word itself, or its normalised form
+    def _key(self, word):
+        return self._normalize(word) if self._normalize else word
+
+    # The most frequent spelling of the word ending at node, from the spelling table
+    def _spelling(self, node, key):
+        i = bisect_left(self.spelling_node, node)
+        if i == len(self.spelling_node) or self.spelling_node[i] != node:
+            return key
+        start = self.spelling_end[i - 1] if i else 0
+        return bytes(self.spelling_text[start:self.spelling_end[i]]).decode('utf-8')
+
+    # Find the child of node along character ch, -1 if absent
+    def _child(self, node, ch):
+        code = ord(ch)
+        start = self.first_child[node]
+        for child in range(start, start + self.child_count[node]):
+            if self.edge_char[child] == code:
+                return child
+        return -1
+
+    # Walk to the node for a plain (wildcard-free) prefix, -1 if absent
+    def _find_node(self, prefix):
+        node = 0
+        for ch in prefix:
+            node = self._child(node, ch)
+            if node < 0:
+                return -1
+        return node
+
+    # Search for a word in the trie
+    def search(self, word):
+        node = self._find_node(self._key(word))
+        return node >= 0 and self.frequency[node] > 0
+
+    # Return all words and their frequencies
+    def get_all_words_with_freq(self, prefix='', frequency=True):
+        prefix = self._key(prefix)
+        start = self._find_node(prefix)
+        if start < 0:
+            return []
+
+        words = []
+        buffer = list(prefix)
+        base = len(buffer)
+        stack = [(start, base)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > base:
+                del buffer[depth - 1:]
+                buffer.append(chr(self.edge_char[node]))
+            freq = self.frequency[node]
+            if freq:
+                word = ''.join(buffer)
+                words.append((word, freq) if frequency else word)
+            first = self.first_child[node]
+            for child in range(first + self.child_count[node] - 1, first - 1, -1):
+                stack.append((child, depth + 1))
+        return words
+
+    # Get predictions with support for wildcards '*'
+    def get_words_with_prefix(self, prefix, max_results=50):
+        prefix = self._key(prefix)
+        results = []
+        buffer = []
+        stack = [(0, 0, 0)]  # (node, index into prefix, depth)
+        while stack and len(results) < max_results:
+            node, index, depth = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(chr(self.edge_char[node]))
+
+            first = self.first_child[node]
+            last = first + self.child_count[node] - 1
+            if index == len(prefix):
+                if self.frequency[node]:
+                    results.append((''.join(buffer), self.frequency[node]))
+                for child in range(last, first - 1, -1):
+                    stack.append((child, index, depth + 1))
+                continue
+
+            ch = prefix[index]
+            if ch == '*':
+                for child in range(last, first - 1, -1):
+                    stack.append((child, index + 1, depth + 1))
+            else:
+                child = self._child(node, ch)
+                if child >= 0:
+                    stack.append((child, index + 1, depth + 1))
+        return results
+
+    # Restore a pattern to its most frequent matching word ('*' matches one character).
+    # Same branch-and-bound search and tie-breaking as Trie.find_best_match.
+    def find_best_match(self, pattern):
+        pattern = self._key(pattern)
+        best_word, best_node, best_freq, best_order = None, -1, 0, None
+        visits = 0
+        length = len(pattern)
+        buffer = []
+        order = []
+        stack = [(0, 0, 0)]  # (node, index into pattern, child position)
+        while stack:
+            node, index, pos = stack.pop()
+            bound = self.max_freq[node]
+            if bound == 0 or bound < best_freq or self.height[node] < length - index:
+                continue
+            if index:
+                del buffer[index - 1:]
+                del order[index - 1:]
+                buffer.append(chr(self.edge_char[node]))
+                order.append(pos)
+            if bound == best_freq and order >= best_order:
+                continue
+            visits += 1
+
+            if index == length:
+                freq = self.frequency[node]
+                if freq and (freq > best_freq or (freq == best_freq and order < best_order)):
+                    best_word, best_node, best_freq, best_order = ''.join(buffer), node, freq, order[:]
+                continue
+
+            ch = pattern[index]
+            if ch == '*':
+                first = self.first_child[node]
+                children = range(first, first + self.child_count[node])
+                ranked = sorted(children, key=lambda c: (-self.max_freq[c], c))
+                for child in reversed(ranked):
+                    stack.append((child, index + 1, child - first))
+            else:
+                child = self._child(node, ch)
+                if child >= 0:
+                    stack.append((child, index + 1, 0))
+
+        self.last_match_visits = visits
+        if best_word is not None and self.spelling_node:
+            return self._spelling(best_node, best_word)
+        return best_word
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python mmap_trie.py <keyword or snapshot file> <output .trie file>")
+        return
+    trie = Trie()
+    trie.load_file(sys.argv[1])
+    count = write_mmap_trie(trie, sys.argv[2])
+    print(f"Memory-mapped trie ({count} nodes) written to '{sys.argv[2]}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# ----------------------------------------
+# persistent_trie.py
+# Trie with cheap saved versions (path copying) for undo/redo
+# ----------------------------------------
+#
+# freeze() hands out the current root as a saved version in O(1). Nodes that
+# belong to a saved version are never modified again: the next insert/delete
+# copies only the nodes on the word's path (one node per character plus the
+# root) and shares every other subtree with the saved versions. Nodes created
+# since the last freeze() belong to the current edit generation and are
+# updated in place, so a run of edits between two saves costs no more than on
+# a plain Trie.
+
+from trie import Trie, TrieNode, _copy_subtree
+
+
+class PersistentTrieNode(TrieNode):
+    __slots__ = ('owner',)  # edit generation allowed to modify this node in place
+
+
+# ----------------------- Persistent Trie Class -----------------------
+class PersistentTrie(Trie):
+    def __init__(self, normalize=None):
+        super().__init__(normalize)
+        self._generation = object()
+        self.root = self._new_node()
+
+    def _new_node(self):
+        node = PersistentTrieNode()
+        node.owner = self._generation
+        return node
+
+    # Return node itself if the current generation owns it, otherwise a copy
+    # (sharing its children) that the caller links in place of it
+    def _own(self, node):
+        if type(node) is PersistentTrieNode and node.owner is self._generation:
+            return node
+        copy = self._new_node()
+        copy.children = dict(node.children)
+        copy.is_end_of_word = node.is_end_of_word
+        copy.frequency = node.frequency
+        copy.max_freq = node.max_freq
+        copy.word_count = node.word_count
+        copy.total_freq = node.total_freq
+        copy.height = node.height
+        if node.surface:
+            copy.surface = dict(node.surface)
+        return copy
+
+    def _insert_path(self, word):
+        current = self.root = self._own(self.root)
+        path = [current]
+        for ch in word:
+            child = current.children.get(ch)
+            child = self._new_node() if child is None else self._own(child)
+            current.children[ch] = child
+            current = child
+            path.append(current)
+        return path
+
+    def _delete_path(self, word):
+        path = Trie._delete_path(self, word)
+        if path is None:
+            return None
+        current = self.root = self._own(path[0])
+        owned = [current]
+        for ch, node in zip(word, path[1:]):
+            child = self._own(node)
+            current.children[ch] = child
+            current = child
+            owned.append(current)
+        return owned
+
+    # Merge never modifies shared nodes: an empty trie takes a copy of other's
+    # nodes, otherwise (or when normalising) other's words are inserted one path at a time
+    def merge(self, other, consume=False):
+        if self._normalize:
+            self.insert_many(other._iter_surface_freqs())
+        elif self.root.children or self.root.is_end_of_word:
+            self.insert_many(other._iter_word_freqs())
+        else:
+            self.root = other.root if consume else _copy_subtree(other.root)
+            self.version += 1
+            self._freq_index = None
+        return self
+
+    # Remove every word (saved versions keep theirs)
+    def clear(self):
+        self.root = self._new_node()
+        self.version += 1
+        self._freq_index = None
+
+    # Save the current state as a version: returns its root, which no later
+    # edit will modify
+    def freeze(self):
+        self._generation = object()
+        return self.root
+
+    # Switch to a version returned by freeze()
+    def restore(self, root):
+        self.root = root
+        self._generation = object()
+        self.version += 1
+        self._freq_index = None
+
+
+# ----------------------- Edit History Class -----------------------
+# Undo/redo stacks and named checkpoints over a PersistentTrie. Every entry
+# is a frozen root, so the memory kept is proportional to the edits made
+# since, not to the size of the dictionary. 'edit' is whatever the caller
+# wants back when the step is undone or redone (e.g. ('+', word)).
+class EditHistory:
+    def __init__(self, trie, limit=None):
+        self.trie = trie
+        self.limit = limit  # undo steps kept, None for no limit
+        self.undo_stack = []  # (root before the edit, edit)
+        self.redo_stack = []  # (root after the edit, edit)
+        self.checkpoints = {}  # name -> root
+
+    # Call before applying an edit to the trie
+    def record(self, edit):
+        self.undo_stack.append((self.trie.freeze(), edit))
+        if self.limit is not None and len(self.undo_stack) > self.limit:
+            del self.undo_stack[0]
+        self.redo_stack.clear()
+
+    # Undo the last edit. Returns its edit, or None if there is nothing to undo.
+    def undo(self):
+        if not self.undo_stack:
+            return None
+        root, edit = self.undo_stack.pop()
+        self.redo_stack.append((self.trie.freeze(), edit))
+        self.trie.restore(root)
+        return edit
+
+    # Redo the last undone edit. Returns its edit, or None if there is nothing to redo.
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        root, edit = self.redo_stack.pop()
+        self.undo_stack.append((self.trie.freeze(), edit))
+        self.trie.restore(root)
+        return edit
+
+    def checkpoint(self, name):
+        self.checkpoints[name] = self.trie.freeze()
+
+    # Go back to a named checkpoint (itself undoable). Returns False if there is no such checkpoint.
+    def restore_checkpoint(self, name):
+        root = self.checkpoints.get(name)
+        if root is None:
+            return False
+        self.record(('checkpoint', name))
+        self.trie.restore(root)
+        return True
+
+    # Edits on the undo stack, oldest first
+    def edits(self):
+        return [edit for _, edit in self.undo_stack]
+
+
+# Readable description of an edit recorded by the editors
+def describe_edit(edit):
+    op = edit[0]
+    if op == '+':
+        return f"add '{edit[1]}'"
+    if op == '-':
+        return f"delete '{edit[1]}'"
+    if op == '=':
+        return f"replace '{edit[1]}' with '{edit[2]}'"
+    if op == '~':
+        return f"load '{edit[1]}'"
+    if op == 'checkpoint':
+        return f"restore checkpoint '{edit[1]}'"
+    return str(edit)
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+# ----------------------- Query Cache Class -----------------------
+# Bounded LRU cache for trie query results. Entries are only valid for the
+# trie version they were computed at; when the version moves on (insert,
+# delete, load) the whole cache is dropped.
+class QueryCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # Return the cached value for key, computing and storing it on a miss
+    def get(self, key, version, compute):
+        if version != self.version:
+            if self.entries:
+                self.entries.clear()
+                self.invalidations += 1
+            self.version = version
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        value = compute()
+        if self.maxsize > 0:
+            self.entries[key] = value
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    # Hit/miss/eviction counters as a dict
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
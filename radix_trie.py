@@ -0,0 +1,252 @@
+from trie import Trie
+
+# ----------------------- Radix Node Class -----------------------
+# Node of a path-compressed trie. 'label' is the string on the edge leading
+# into the node, so a chain of single-child characters is stored once.
+class RadixNode:
+    __slots__ = ('label', 'children', 'is_end_of_word', 'frequency')
+
+    def __init__(self, label=''):
+        self.label = label
+        self.children = {}  # first character of child label -> child node
+        self.is_end_of_word = False
+        self.frequency = 0
+
+# ----------------------- Radix Trie Class -----------------------
+# Patricia/radix variant of Trie. Edges carry string labels that are split on
+# insert and re-merged on delete. Wildcard queries, word order and the
+# display()/save_trie_visual() output are the same as Trie's.
+class RadixTrie:
+    def __init__(self):
+        self.root = RadixNode()
+
+    # Insert a word and update frequency (count occurrences in a single path walk)
+    def insert(self, word, count=1):
+        if count <= 0:
+            return
+        node = self.root
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                leaf = RadixNode(word[i:])
+                node.children[word[i]] = leaf
+                node = leaf
+                break
+
+            # Length of the common prefix between the edge label and the rest of the word
+            label = child.label
+            j = 0
+            limit = min(len(label), len(word) - i)
+            while j < limit and label[j] == word[i + j]:
+                j += 1
+
+            if j < len(label):
+                # Split the edge: the shared part becomes a new intermediate node
+                mid = RadixNode(label[:j])
+                child.label = label[j:]
+                mid.children[child.label[0]] = child
+                node.children[word[i]] = mid
+                child = mid
+            node = child
+            i += j
+
+        if node.is_end_of_word:
+            node.frequency += count
+        else:
+            node.is_end_of_word = True
+            node.frequency = count
+
+    # Insert many (word, freq) pairs, one path walk per pair
+    def insert_many(self, words_with_freq):
+        for word, freq in words_with_freq:
+            self.insert(word, freq)
+
+    # Merge a non-word node with its only child
+    def _merge_with_child(self, node):
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.is_end_of_word = child.is_end_of_word
+        node.frequency = child.frequency
+
+    # Delete one occurrence of a word, re-merging edges that become unary
+    def delete(self, word):
+        parent = None
+        node = self.root
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None or not word.startswith(child.label, i):
+                return
+            parent, node = node, child
+            i += len(child.label)
+
+        if not node.is_end_of_word:
+            return
+        node.frequency -= 1
+        if node.frequency > 0:
+            return
+        node.is_end_of_word = False
+        node.frequency = 0
+
+        if node is self.root:
+            return
+        if not node.children:
+            del parent.children[node.label[0]]
+            if parent is not self.root and not parent.is_end_of_word and len(parent.children) == 1:
+                self._merge_with_child(parent)
+        elif len(node.children) == 1:
+            self._merge_with_child(node)
+
+    # Find the node and label offset reached by a plain prefix, (None, 0) if absent
+    def _find_position(self, prefix):
+        node = self.root
+        offset = 0
+        for ch in prefix:
+            if offset < len(node.label):
+                if node.label[offset] != ch:
+                    return None, 0
+                offset += 1
+            else:
+                node = node.children.get(ch)
+                if node is None:
+                    return None, 0
+                offset = 1
+        return node, offset
+
+    # Search for a word in the trie
+    def search(self, word):
+        node, offset = self._find_position(word)
+        return node is not None and offset == len(node.label) and node.is_end_of_word
+
+    # Yield (word, node) for every word under node, preorder, children in insertion order.
+    # 'buffer' holds the characters up to and including node's label.
+    def _iter_words(self, node, buffer):
+        stack = [(node, len(buffer))]
+        first = True
+        while stack:
+            current, depth = stack.pop()
+            if first:
+                first = False
+            else:
+                del buffer[depth - len(current.label):]
+                buffer.extend(current.label)
+            if current.is_end_of_word:
+                yield ''.join(buffer), current
+            for child in reversed(list(current.children.values())):
+                stack.append((child, depth + len(child.label)))
+
+    # Return all words and their frequencies
+    def get_all_words_with_freq(self, prefix='', frequency=True):
+        node, offset = self._find_position(prefix)
+        if node is None:
+            return []
+        buffer = list(prefix) + list(node.label[offset:])
+        words = []
+        for word, end_node in self._iter_words(node, buffer):
+            words.append((word, end_node.frequency) if frequency else word)
+        return words
+
+    # Yield (node, offset, buffer) for every position matched by a pattern with '*' wildcards
+    def _iter_pattern(self, pattern):
+        buffer = []
+        stack = [(self.root, 0, 0)]
+        while stack:
+            node, offset, index = stack.pop()
+            if index:
+                del buffer[index - 1:]
+                buffer.append(pattern[index - 1] if pattern[index - 1] != '*' else node.label[offset - 1])
+            if index == len(pattern):
+                yield node, offset, buffer
+                continue
+
+            ch = pattern[index]
+            if offset < len(node.label):
+                if ch == '*' or node.label[offset] == ch:
+                    stack.append((node, offset + 1, index + 1))
+            elif ch == '*':
+                for child in reversed(list(node.children.values())):
+                    stack.append((child, 1, index + 1))
+            elif ch in node.children:
+                stack.append((node.children[ch], 1, index + 1))
+
+    # Get predictions with support for wildcards '*'
+    def get_words_with_prefix(self, prefix, max_results=50):
+        results = []
+        if max_results <= 0:
+            return results
+        for node, offset, buffer in self._iter_pattern(prefix):
+            tail = list(buffer) + list(node.label[offset:])
+            for word, end_node in self._iter_words(node, tail):
+                results.append((word, end_node.frequency))
+                if len(results) >= max_results:
+                    return results
+        return results
+
+    # Restore a pattern to its most frequent matching word ('*' matches one character)
+    def find_best_match(self, pattern):
+        best_word, best_freq = "", -1
+        for node, offset, buffer in self._iter_pattern(pattern):
+            if offset == len(node.label) and node.is_end_of_word and node.frequency > best_freq:
+                best_word, best_freq = ''.join(buffer), node.frequency
+        return best_word if best_freq > 0 else None
+
+    # Yield the bracketed visual lines, one virtual level per character so the
+    # output is identical to Trie.display()
+    def _visual_lines(self):
+        yield "["
+        buffer = []
+        stack = [(child, 0, False) for _, child in sorted(self.root.children.items(), reverse=True)]
+        while stack:
+            node, depth, closing = stack.pop()
+            label = node.label
+            if closing:
+                for i in range(len(label) - 1, -1, -1):
+                    yield '.' * (depth + i + 1) + ']'
+                del buffer[depth:]
+                continue
+
+            del buffer[depth:]
+            for i, ch in enumerate(label):
+                buffer.append(ch)
+                yield '.' * (depth + i + 1) + '[' + ''.join(buffer)
+            end_depth = depth + len(label)
+            if node.is_end_of_word:
+                yield '.' * (end_depth + 1) + '>' + ''.join(buffer) + f"({node.frequency})*"
+
+            stack.append((node, depth, True))
+            for _, child in sorted(node.children.items(), reverse=True):
+                stack.append((child, end_depth, False))
+        yield "]"
+
+    # Display the trie visually with indentations
+    def display(self):
+        for line in self._visual_lines():
+            print(line)
+
+    # Save visual representation of the trie to file
+    def save_trie_visual(self, filename):
+        try:
+            with open(filename, 'w') as f:
+                for line in self._visual_lines():
+                    f.write(line + "\n")
+            print(f"Trie visual saved to '{filename}'.")
+        except Exception as e:
+            print(f"Error saving trie visual: {e}")
+
+    # Load keywords from file and populate the trie
+    load_keywords_from_file = Trie.load_keywords_from_file
+
+    # Save Keywords to File
+    save_keywords_to_file = Trie.save_keywords_to_file
+
+    # Number of nodes (including the root)
+    def node_count(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
@@ -0,0 +1,50 @@
+# ----------------------------------------
+# text_normalize.py
+# Keyword normalisation modes for case/Unicode-insensitive tries
+# ----------------------------------------
+#
+# A trie created with Trie(normalize=mode) stores every word under its
+# normalised key, so 'Car', 'car' and 'CAR' share one branch and a lookup in
+# any case finds it. The original spellings are kept as surface forms at the
+# end-of-word node: keyword files store every spelling, restoration returns the
+# most frequent one, and snapshot and visual files store only the keys.
+
+import unicodedata
+
+DEFAULT_NORMALIZATION = 'nfkc_casefold'
+
+
+# NFKC + case folding (NFKC again afterwards, since folding can un-normalise)
+def nfkc_casefold(text):
+    return unicodedata.normalize('NFKC', unicodedata.normalize('NFKC', text).casefold())
+
+
+def nfkc(text):
+    return unicodedata.normalize('NFKC', text)
+
+
+NORMALIZERS = {
+    'none': None,
+    'nfkc': nfkc,
+    'casefold': str.casefold,
+    'nfkc_casefold': nfkc_casefold,
+}
+
+
+# Resolve a normalisation mode: None, a name from NORMALIZERS or any str -> str callable
+def get_normalizer(mode):
+    if mode is None or callable(mode):
+        return mode
+    try:
+        return NORMALIZERS[mode]
+    except KeyError:
+        raise ValueError(f"unknown normalisation mode '{mode}' "
+                         f"(expected one of: {', '.join(NORMALIZERS)})") from None
+
+
+# A keyword is made of letters, in any script, optionally with combining marks
+# (accents that NFKC could not fold into the letter)
+def is_keyword(word):
+    if not word or not word[0].isalpha():
+        return False
+    return all(ch.isalpha() or unicodedata.category(ch).startswith('M') for ch in word)
@@ -0,0 +1,143 @@
+# ----------------------------------------
+# text_restorer.py
+# Streaming file-to-file text restoration
+# ----------------------------------------
+
+import argparse
+import os
+import tempfile
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from mmap_trie import MmapTrie, is_mmap_trie_file, write_mmap_trie
+from trie import Trie
+
+# Trie held by each worker process, opened once by _init_worker
+_worker_trie = None
+
+
+# Workers map the same file, so they share one page-cached copy of the trie
+def _init_worker(trie_file):
+    global _worker_trie
+    _worker_trie = MmapTrie(trie_file)
+
+
+# Restore a chunk of lines with the same semantics as the '@' / '&' commands
+def restore_lines(trie, lines, all_matches=False):
+    restored = []
+    tokens = 0
+    for line in lines:
+        words = trie.separate_words(line)
+        tokens += len(words)
+        if all_matches:
+            restored.append(trie.loop_Sentence_AllMatches(words))
+        else:
+            restored.append(trie.loop_Sentence(words))
+    return restored, tokens
+
+
+def _restore_chunk(args):
+    lines, all_matches = args
+    return restore_lines(_worker_trie, lines, all_matches)
+
+
+# Group an iterable of lines into lists of at most chunk_size lines
+def _chunks(lines, chunk_size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Write the trie to a temporary memory-mappable file that worker processes can open
+# (its normalisation mode and preferred spellings go with it)
+def _dump_trie(trie):
+    fd, path = tempfile.mkstemp(suffix='.trie', prefix='trie_')
+    os.close(fd)
+    write_mmap_trie(trie, path)
+    return path
+
+
+# Restore input_file into output_file line by line.
+# Chunks of lines are fanned out to a process pool whose workers memory-map
+# the trie (an MmapTrie is shared as is, a Trie is written to a temporary
+# mmap file first); at most 2 * workers chunks are in flight, and results are
+# written in input order as soon as they are ready, so memory stays bounded.
+# Returns a stats dict with line/token counts and throughput.
+def restore_file(trie, input_file, output_file, workers=None, chunk_size=1000, all_matches=False):
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    start = time.perf_counter()
+    lines_done = 0
+    tokens_done = 0
+
+    with open(input_file, 'r') as fin, open(output_file, 'w') as fout:
+        lines = (line.rstrip('\n') for line in fin)
+
+        def _write(result):
+            nonlocal lines_done, tokens_done
+            restored, tokens = result
+            fout.write('\n'.join(restored) + '\n')
+            lines_done += len(restored)
+            tokens_done += tokens
+
+        # A custom normalisation function cannot be recorded in the mmap file
+        if workers <= 1 or callable(getattr(trie, 'normalization', None)):
+            for chunk in _chunks(lines, chunk_size):
+                _write(restore_lines(trie, chunk, all_matches))
+        else:
+            shared = isinstance(trie, MmapTrie)
+            trie_file = trie.filename if shared else _dump_trie(trie)
+            try:
+                with Pool(workers, initializer=_init_worker, initargs=(trie_file,)) as pool:
+                    pending = deque()
+                    for chunk in _chunks(lines, chunk_size):
+                        pending.append(pool.apply_async(_restore_chunk, ((chunk, all_matches),)))
+                        if len(pending) >= 2 * workers:
+                            _write(pending.popleft().get())
+                    while pending:
+                        _write(pending.popleft().get())
+            finally:
+                if not shared:
+                    os.remove(trie_file)
+
+    seconds = time.perf_counter() - start
+    return {
+        'lines': lines_done,
+        'tokens': tokens_done,
+        'seconds': seconds,
+        'lines_per_sec': lines_done / seconds if seconds else 0.0,
+        'tokens_per_sec': tokens_done / seconds if seconds else 0.0,
+    }
+
+
+def print_restore_report(stats):
+    print(f"Restored {stats['lines']} lines ({stats['tokens']} tokens) in {stats['seconds']:.2f}s "
+          f"- {stats['lines_per_sec']:.0f} lines/sec, {stats['tokens_per_sec']:.0f} tokens/sec.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Restore '*'-masked words in a text file using a keyword file.")
+    parser.add_argument('keywords', help="keyword, snapshot or memory-mapped trie file")
+    parser.add_argument('input', help="text file to restore")
+    parser.add_argument('output', help="file to write the restored text to")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="lines per worker task")
+    parser.add_argument('--all', action='store_true', help="list all matches instead of the best one")
+    args = parser.parse_args()
+
+    if is_mmap_trie_file(args.keywords):
+        trie = MmapTrie(args.keywords)
+    else:
+        trie = Trie()
+        trie.load_file(args.keywords)
+    stats = restore_file(trie, args.input, args.output, args.workers, args.chunk_size, args.all)
+    print_restore_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,378 @@
+import heapq
 import string
+import sys
+
+from completion_cursor import CompletionCursor
+from frequency_index import FrequencyIndex
+from keyword_io import load_keywords, save_keywords
+from query_cache import QueryCache
+from text_normalize import get_normalizer
+from trie_journal import replay_journal
+from trie_snapshot import is_snapshot_file, read_snapshot, write_snapshot
+from trie_visual import is_visual_file, read_trie_visual
+
+VISUAL_WRITE_BUFFER = 1 << 20  # bytes buffered when writing visual files
 
 # ----------------------- Trie Node Class -----------------------
 # Class created by Aaron to represent each node in the trie
 class TrieNode:
+    __slots__ = ('children', 'is_end_of_word', 'frequency', 'max_freq', 'word_count', 'total_freq', 'height',
+                 'surface')
+
     def __init__(self):
         self.children = {}
         self.is_end_of_word = False
         self.frequency = 0  # Stores frequency of word appearance
+        self.max_freq = 0  # Highest word frequency in this node's subtree (for top-k)
+        self.word_count = 0  # Number of distinct words in this node's subtree
+        self.total_freq = 0  # Sum of word frequencies in this node's subtree
+        self.height = 0  # Length of the longest word below this node (relative depth)
+        self.surface = None  # {original spelling: freq} for spellings that differ from the normalised key
+
+# Deep copy of a node and its subtree, aggregates included
+def _copy_subtree(node):
+    copy = TrieNode()
+    stack = [(node, copy)]
+    while stack:
+        src, dst = stack.pop()
+        dst.is_end_of_word = src.is_end_of_word
+        dst.frequency = src.frequency
+        dst.max_freq = src.max_freq
+        dst.word_count = src.word_count
+        dst.total_freq = src.total_freq
+        dst.height = src.height
+        if src.surface:
+            dst.surface = dict(src.surface)
+        for ch, child in src.children.items():
+            new_child = TrieNode()
+            dst.children[ch] = new_child
+            stack.append((child, new_child))
+    return copy
+
+# The spelling an end node was inserted under most often, None when that is
+# the normalised key itself (which also wins ties)
+def _preferred_spelling(node):
+    if not node.surface:
+        return None
+    best, best_freq = None, node.frequency - sum(node.surface.values())
+    for form, freq in node.surface.items():
+        if freq > best_freq:
+            best, best_freq = form, freq
+    return best
 
 # ----------------------- Trie Class -----------------------
 # Class created by Aaron. Main trie implementation to support insert, delete, search, etc.
+# normalize: None (keys are the raw characters), a mode name from
+# text_normalize.NORMALIZERS such as 'nfkc_casefold', or a str -> str callable.
 class Trie:
-    def __init__(self):
+    def __init__(self, normalize=None):
+        self.normalization = normalize  # mode as given, recorded by write_mmap_trie
+        self._normalize = get_normalizer(normalize)
         self.root = TrieNode()
+        self.last_match_visits = 0  # Nodes visited by the most recent find_best_match
+        self.version = 0  # Bumped on every change, invalidates cached query results
+        self.query_cache = QueryCache()
+        self._freq_index = None  # FrequencyIndex, built on first use and then kept up to date
     
-    # Insert a word and update frequency
-    def insert(self, word):
+    # The key a word is stored under: the word itself, or its normalised form
+    def _key(self, word):
+        return self._normalize(word) if self._normalize else word
+
+    # Insert a word and update frequency (count occurrences in a single path walk)
+    def insert(self, word, count=1):
+        if count <= 0:
+            return
+        surface = word
+        if self._normalize:
+            word = self._normalize(word)
+        self.version += 1
+        path = self._insert_path(word)
+        current = path[-1]
+        if surface is not word and surface != word:
+            if current.surface is None:
+                current.surface = {}
+            current.surface[surface] = current.surface.get(surface, 0) + count
+        new_word = not current.is_end_of_word
+        if current.is_end_of_word:
+            current.frequency += count  # increment if already exists
+        else:
+            current.is_end_of_word = True
+            current.frequency = count  # new word
+        if self._freq_index is not None:
+            self._freq_index.update(word, current.frequency - count, current.frequency)
+
+        # Update the subtree aggregates along the path. Frequencies only grow on
+        # insert, so the subtree maxima can be raised in place
+        for depth, node in enumerate(path):
+            node.total_freq += count
+            if new_word:
+                node.word_count += 1
+            if node.max_freq < current.frequency:
+                node.max_freq = current.frequency
+            if node.height < len(word) - depth:
+                node.height = len(word) - depth
+
+    # Nodes from the root to word's end node, creating missing ones; every node
+    # returned may be modified (PersistentTrie copies shared ones here)
+    def _insert_path(self, word):
         current = self.root
+        path = [current]
         for ch in word:
             if ch not in current.children:
                 current.children[ch] = TrieNode()
             current = current.children[ch]
-        if current.is_end_of_word:
-            current.frequency += 1  # increment if already exists
-        else:
-            current.is_end_of_word = True
-            current.frequency = 1  # new word
+            path.append(current)
+        return path
+
+    # Nodes from the root to word's end node, None if word is not in the trie;
+    # every node returned may be modified (see _insert_path)
+    def _delete_path(self, word):
+        current = self.root
+        path = [current]
+        for ch in word:
+            current = current.children.get(ch)
+            if current is None:
+                return None
+            path.append(current)
+        return path if current.is_end_of_word else None
+
+    # Insert many (word, freq) pairs, one path walk per pair
+    def insert_many(self, words_with_freq):
+        for word, freq in words_with_freq:
+            self.insert(word, freq)
     
+    # Recompute a node's subtree maximum frequency and height from its children
+    def _update_bounds(self, node):
+        best = node.frequency if node.is_end_of_word else 0
+        height = 0
+        for child in node.children.values():
+            if child.max_freq > best:
+                best = child.max_freq
+            if child.height >= height:
+                height = child.height + 1
+        node.max_freq = best
+        node.height = height
+
+    # Recompute every node's subtree aggregates bottom-up, after the node
+    # structure was built directly (snapshot or bulk load) rather than by insert.
+    # 'nodes' optionally limits this to a list of nodes that has every parent before
+    # its children (e.g. preorder); nodes outside it must already be up to date.
+    def _rebuild_aggregates(self, nodes=None):
+        if nodes is None:
+            nodes = []
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                stack.extend(node.children.values())
+
+        # Children always come after their parent in preorder
+        for node in reversed(nodes):
+            if node.is_end_of_word:
+                word_count, total_freq, max_freq = 1, node.frequency, node.frequency
+            else:
+                word_count = total_freq = max_freq = 0
+            height = 0
+            for child in node.children.values():
+                word_count += child.word_count
+                total_freq += child.total_freq
+                if child.max_freq > max_freq:
+                    max_freq = child.max_freq
+                if child.height >= height:
+                    height = child.height + 1
+            node.word_count = word_count
+            node.total_freq = total_freq
+            node.max_freq = max_freq
+            node.height = height
+        self.version += 1
+        self._freq_index = None  # words changed in bulk, rebuilt on next use
+
+    # Merge another trie into this one node by node: frequencies of shared words
+    # are summed and subtrees missing here are adopted whole. The adopted
+    # subtrees are copied unless consume=True, in which case 'other' must not be
+    # used afterwards. A normalising trie inserts other's words (in every
+    # spelling) instead, so they are filed under its own keys.
+    def merge(self, other, consume=False):
+        if self._normalize:
+            self.insert_many(other._iter_surface_freqs())
+            return self
+
+        paired = []
+        stack = [(self.root, other.root)]
+        while stack:
+            mine, theirs = stack.pop()
+            paired.append(mine)
+            if theirs.is_end_of_word:
+                mine.is_end_of_word = True
+                mine.frequency += theirs.frequency
+                if theirs.surface:
+                    surface = mine.surface if mine.surface is not None else {}
+                    for form, freq in theirs.surface.items():
+                        surface[form] = surface.get(form, 0) + freq
+                    mine.surface = surface
+            for ch, their_child in theirs.children.items():
+                my_child = mine.children.get(ch)
+                if my_child is None:
+                    mine.children[ch] = their_child if consume else _copy_subtree(their_child)
+                else:
+                    stack.append((my_child, their_child))
+
+        # Adopted subtrees keep their own aggregates; only the shared nodes need
+        # recomputing, and 'paired' lists every parent before its children
+        self._rebuild_aggregates(paired)
+        return self
+
+    # Walk this trie and other in lockstep and yield (word, freq) for the set
+    # operation 'op'. For words in both tries the frequencies go through
+    # combine(mine, theirs); by default this trie's frequency is kept for
+    # intersection and the two are summed for union. Intersection never descends
+    # into a subtree that only one side has.
+    def _iter_set_op(self, other, op, combine=None):
+        if combine is None:
+            combine = (lambda a, b: a + b) if op == 'union' else (lambda a, b: a)
+        keep_mine = op in ('union', 'difference', 'symmetric_difference')
+        keep_theirs = op in ('union', 'symmetric_difference')
+
+        buffer = []
+        stack = [(self.root, other.root, '', 0)]
+        while stack:
+            mine, theirs, ch, depth = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(ch)
+
+            in_mine = mine is not None and mine.is_end_of_word
+            in_theirs = theirs is not None and theirs.is_end_of_word
+            if in_mine and in_theirs:
+                if op in ('intersection', 'union'):
+                    yield ''.join(buffer), combine(mine.frequency, theirs.frequency)
+            elif in_mine and keep_mine:
+                yield ''.join(buffer), mine.frequency
+            elif in_theirs and keep_theirs:
+                yield ''.join(buffer), theirs.frequency
+
+            # Children to visit, in the order they would be listed (pushed reversed)
+            pairs = []
+            if mine is not None:
+                for next_ch, child in mine.children.items():
+                    their_child = theirs.children.get(next_ch) if theirs is not None else None
+                    if their_child is not None or keep_mine:
+                        pairs.append((child, their_child, next_ch))
+            if theirs is not None and keep_theirs:
+                for next_ch, child in theirs.children.items():
+                    if mine is None or next_ch not in mine.children:
+                        pairs.append((None, child, next_ch))
+            for child, their_child, next_ch in reversed(pairs):
+                stack.append((child, their_child, next_ch, depth + 1))
+
+    def _set_op_result(self, other, op, combine, stream):
+        words = self._iter_set_op(other, op, combine)
+        if stream:
+            return words
+        result = Trie()
+        result.insert_many(words)
+        return result
+
+    # Words in both tries. Returns a new Trie, or a (word, freq) generator if stream=True
+    def intersection(self, other, combine=None, stream=False):
+        return self._set_op_result(other, 'intersection', combine, stream)
+
+    # Words in either trie (shared frequencies summed unless combine is given)
+    def union(self, other, combine=None, stream=False):
+        return self._set_op_result(other, 'union', combine, stream)
+
+    # Words in this trie but not in other
+    def difference(self, other, stream=False):
+        return self._set_op_result(other, 'difference', None, stream)
+
+    # Words in exactly one of the two tries
+    def symmetric_difference(self, other, stream=False):
+        return self._set_op_result(other, 'symmetric_difference', None, stream)
+
     # Delete one occurrence of a word
     def delete(self, word):
-        def _delete(node, word, depth):
-            if depth == len(word):
-                if not node.is_end_of_word:
-                    return False  # Word doesn't exist
-                node.frequency -= 1
-                if node.frequency <= 0:
-                    node.is_end_of_word = False
-                    node.frequency = 0
-                    return len(node.children) == 0
-                return False
-            
-            ch = word[depth]
-            if ch not in node.children:
-                return False
-            
-            should_delete_child = _delete(node.children[ch], word, depth + 1)
-            
-            if should_delete_child:
-                del node.children[ch]
-                return not node.is_end_of_word and len(node.children) == 0
-            
-            return False
-        
-        _delete(self.root, word, 0)
-    
-    # Search for a word in the trie
+        self._decrease(word, 1)
+
+    # Lower word's frequency by count (None = remove the word entirely), pruning
+    # nodes that no longer lead to a word. Returns the frequency taken away.
+    def _decrease(self, word, count=None):
+        surface, word = word, self._key(word)
+        path = self._delete_path(word)
+        if path is None:
+            return 0  # Word doesn't exist
+        current = path[-1]
+
+        self.version += 1
+        old_freq = current.frequency
+        taken = old_freq if count is None else min(count, old_freq)
+        current.frequency -= taken
+        removed = current.frequency <= 0
+        if removed:
+            current.is_end_of_word = False
+            current.frequency = 0
+            current.surface = None
+        elif current.surface:
+            self._take_surface(current, surface, taken)
+        if self._freq_index is not None:
+            self._freq_index.update(word, old_freq, current.frequency)
+
+        # Walk back up the path: prune nodes that no longer lead to a word and
+        # refresh the subtree aggregates of the rest
+        for depth in range(len(word), -1, -1):
+            node = path[depth]
+            if depth and not node.is_end_of_word and not node.children:
+                del path[depth - 1].children[word[depth - 1]]
+                continue
+            node.total_freq -= taken
+            if removed:
+                node.word_count -= 1
+            self._update_bounds(node)
+        return taken
+
+    # Take 'taken' occurrences off an end node's spellings (its frequency is
+    # already lowered): the spelling given first, then the normalised key
+    # itself, then the other spellings
+    def _take_surface(self, node, surface, taken):
+        forms = node.surface
+        if surface in forms:
+            forms[surface] -= min(taken, forms[surface])
+        excess = sum(forms.values()) - node.frequency
+        for form in forms:
+            if excess <= 0:
+                break
+            step = min(excess, forms[form])
+            forms[form] -= step
+            excess -= step
+        node.surface = {form: freq for form, freq in forms.items() if freq > 0} or None
+
+    # Rename a word in place: its whole frequency moves to new (added to new's own
+    # frequency if new already exists) and the branch left empty by old is pruned.
+    # Two path walks, O(len(old) + len(new)). Returns the frequency moved, 0 if old is absent.
+    def rename(self, old, new):
+        if old == new or (self._normalize and self._key(old) == self._key(new)):
+            node = self._find_node(self._key(old))
+            return node.frequency if node is not None and node.is_end_of_word else 0
+        freq = self._decrease(old)
+        if freq:
+            self.insert(new, freq)
+        return freq
+
+    # Apply (old, new) renames in order. Returns (renamed, missing) counts.
+    def rename_many(self, pairs):
+        renamed = missing = 0
+        for old, new in pairs:
+            if self.rename(old, new):
+                renamed += 1
+            else:
+                missing += 1
+        return renamed, missing
+
+    # Search for a word in the trie (cached)
     def search(self, word):
+        word = self._key(word)
+        return self.query_cache.get(('search', word), self.version, lambda: self._search(word))
+
+    def _search(self, word):
         current = self.root
         for ch in word:
             if ch not in current.children:
@@ -63,187 +380,493 @@ class Trie:
             current = current.children[ch]
         return current.is_end_of_word
     
-    # Display the trie visually with indentations
-    def display(self, node=None):
-        if node is None:
-            node = self.root
-        
-        def _display(current, prefix, depth):
-            lines = []
+    # Walk to the node for a plain (wildcard-free) prefix, None if absent
+    def _find_node(self, prefix):
+        current = self.root
+        for ch in prefix:
+            current = current.children.get(ch)
+            if current is None:
+                return None
+        return current
+
+    # Frequency index over every word, built by one traversal the first time it is needed
+    def _frequency_index(self):
+        if self._freq_index is None:
+            self._freq_index = FrequencyIndex(self._iter_word_freqs())
+        return self._freq_index
+
+    # The n most frequent (word, freq) pairs, highest first
+    def most_frequent(self, n):
+        return self._frequency_index().most_frequent(n)
+
+    # (word, freq) pairs with lo <= freq <= hi (hi=None for no upper limit), highest first
+    def words_with_frequency_between(self, lo, hi=None):
+        return list(self._frequency_index().iter_between(lo, hi))
+
+    # Number of nodes (including the root)
+    def node_count(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+    # Number of distinct words starting with prefix
+    def count_prefix(self, prefix=''):
+        node = self._find_node(self._key(prefix))
+        return node.word_count if node else 0
+
+    # Summed frequency of all words starting with prefix
+    def frequency_under(self, prefix=''):
+        node = self._find_node(self._key(prefix))
+        return node.total_freq if node else 0
+
+    # Number of words that sort lexicographically before word (word need not be present)
+    def rank(self, word):
+        word = self._key(word)
+        count = 0
+        current = self.root
+        for ch in word:
+            if current.is_end_of_word:
+                count += 1  # a proper prefix of word sorts before it
+            for next_ch, child in current.children.items():
+                if next_ch < ch:
+                    count += child.word_count
+            current = current.children.get(ch)
+            if current is None:
+                break
+        return count
+
+    # The i-th word (0-based) in lexicographic order, None if out of range
+    def select(self, i):
+        if i < 0 or i >= self.root.word_count:
+            return None
+        path = []
+        current = self.root
+        while True:
+            if current.is_end_of_word:
+                if i == 0:
+                    return ''.join(path)
+                i -= 1
+            for ch, child in sorted(current.children.items()):
+                if i < child.word_count:
+                    path.append(ch)
+                    current = child
+                    break
+                i -= child.word_count
+
+    # Yield (word, node) for every word under start_node in preorder, children in
+    # insertion order. Uses an explicit stack and one shared character buffer, so
+    # strings are only built at end-of-word nodes and depth is not limited by recursion.
+    def _iter_words(self, start_node, prefix=''):
+        buffer = list(prefix)
+        base = len(buffer)
+        stack = [(start_node, '', base)]
+        while stack:
+            node, ch, depth = stack.pop()
+            if depth > base:
+                del buffer[depth - 1:]
+                buffer.append(ch)
+            if node.is_end_of_word:
+                yield ''.join(buffer), node
+            if node.children:
+                stack.extend((child, next_ch, depth + 1) for next_ch, child in reversed(node.children.items()))
+
+    # Yield (word, frequency) for every word in the trie
+    def _iter_word_freqs(self):
+        for word, node in self._iter_words(self.root):
+            yield word, node.frequency
+
+    # Yield the bracketed visual lines for the subtree below node (the root by default).
+    # 'prefix' renders only that prefix's subtree (with the same indentation it has in
+    # the full view), 'max_depth' stops expanding below that many characters and
+    # 'max_lines' cuts the output off with a note. Lines are produced one at a time,
+    # so rendering memory does not grow with the size of the trie.
+    def iter_visual_lines(self, node=None, max_depth=None, prefix='', max_lines=None):
+        prefix = self._key(prefix)
+        buffer = []
+        ancestors = []  # opening lines of the nodes above the prefix's node
+        if prefix:
+            node = self._find_node(prefix)
+            stack = []
+            if node:
+                # The ancestors are opened first and closed after the subtree, so
+                # every level keeps its own pair of brackets
+                for depth in range(1, len(prefix)):
+                    ancestors.append('.' * depth + '[' + prefix[:depth])
+                    stack.append((None, prefix[depth - 1], depth, True))
+                stack.append((node, prefix[-1], len(prefix), False))
+            buffer = list(prefix[:-1])
+        else:
+            if node is None:
+                node = self.root
+            stack = [(child, ch, 1, False) for ch, child in sorted(node.children.items(), reverse=True)]
+
+        # Every line counts towards max_lines; once the limit is reached a note
+        # (which starts with neither '.' nor a bracket) replaces the rest
+        def out_of_lines():
+            return max_lines is not None and lines >= max_lines
+
+        truncated = f"(output truncated after {max_lines} lines)"
+        yield "["
+        lines = 1
+        for line in ancestors:
+            if out_of_lines():
+                yield truncated
+                return
+            lines += 1
+            yield line
+        while stack:
+            if out_of_lines():
+                yield truncated
+                return
+            current, ch, depth, closing = stack.pop()
             indent = '.' * depth
-            
+            lines += 1
+            if closing:
+                yield indent + ']'
+                continue
+
+            del buffer[depth - 1:]
+            buffer.append(ch)
+            path = ''.join(buffer)
+
             # Print the prefix at the current level
-            lines.append(indent + '[' + prefix)
-            
+            yield indent + '[' + path
+
             # If it's a word, print it with frequency
             if current.is_end_of_word:
-                lines.append('.' * (depth + 1) + f">" + prefix + f"({current.frequency})*")
-            
-            # Recurse into children
-            for ch, next_node in sorted(current.children.items()):
-                lines.extend(_display(next_node, prefix + ch, depth + 1))
-            
-            # Closing bracket
-            lines.append(indent + ']')
-            return lines
-        
-        print("[")
-        for ch, next_node in sorted(node.children.items()):
-            result = _display(next_node, ch, 1)
-            for line in result:
-                print(line)
-        print("]")
+                if out_of_lines():
+                    yield truncated
+                    return
+                lines += 1
+                yield '.' * (depth + 1) + '>' + path + f"({current.frequency})*"
+
+            # Closing bracket comes after all children
+            stack.append((current, ch, depth, True))
+            if max_depth is None or depth < max_depth:
+                for next_ch, next_node in sorted(current.children.items(), reverse=True):
+                    stack.append((next_node, next_ch, depth + 1, False))
+            elif current.children:
+                if out_of_lines():
+                    yield truncated
+                    return
+                lines += 1
+                hidden = current.word_count - current.is_end_of_word
+                yield f"({hidden} more word(s) below '{path}' hidden by max_depth={max_depth})"
+        if out_of_lines():
+            yield truncated
+            return
+        yield "]"
+
+    # Write the visual lines to a file-like object as they are generated
+    def write_visual(self, out, node=None, max_depth=None, prefix='', max_lines=None):
+        write = out.write
+        for line in self.iter_visual_lines(node, max_depth, prefix, max_lines):
+            write(line)
+            write('\n')
+
+    # Display the trie visually with indentations
+    def display(self, node=None, max_depth=None, prefix='', max_lines=None):
+        self.write_visual(sys.stdout, node, max_depth, prefix, max_lines)
     
+    # Spellings a word was inserted under, as (spelling, freq) with the
+    # normalised key first; just [(word, freq)] when no other spelling was seen
+    def surface_forms(self, word):
+        key = self._key(word)
+        node = self._find_node(key)
+        if node is None or not node.is_end_of_word:
+            return []
+        forms = node.surface or {}
+        key_count = node.frequency - sum(forms.values())
+        result = [(key, key_count)] if key_count > 0 else []
+        return result + sorted(forms.items(), key=lambda x: -x[1])
+
+    # Return every word in every spelling it was inserted under, with its frequency
+    # (the same as get_all_words_with_freq on a trie that does not normalise)
+    def get_all_spellings_with_freq(self):
+        return list(self._iter_surface_freqs())
+
+    # Yield (spelling, freq) for every word in every spelling it was inserted under
+    def _iter_surface_freqs(self):
+        for word, node in self._iter_words(self.root):
+            if node.surface:
+                key_count = node.frequency - sum(node.surface.values())
+                if key_count > 0:
+                    yield word, key_count
+                yield from node.surface.items()
+            else:
+                yield word, node.frequency
+
     # Return all words and their frequencies
     def get_all_words_with_freq(self, prefix='', frequency=True):
-        # Helper: find the node of the prefix first
-        def find_prefix_node(node, prefix):
-            current = node
-            for ch in prefix:
-                if ch not in current.children:
-                    return None
-                current = current.children[ch]
-            return current
-
-        start_node = find_prefix_node(self.root, prefix)
+        prefix = self._key(prefix)
+        start_node = self._find_node(prefix)
         if not start_node:
             return []
 
-        words = []
-
-        def _dfs(current, current_prefix):
-            if current.is_end_of_word:
-                if frequency:
-                    words.append((current_prefix, current.frequency))
-                else:
-                    words.append(current_prefix)
-            for ch, node in current.children.items():
-                _dfs(node, current_prefix + ch)
-
-        _dfs(start_node, prefix)
-        return words
+        if frequency:
+            return [(word, node.frequency) for word, node in self._iter_words(start_node, prefix)]
+        return [word for word, _ in self._iter_words(start_node, prefix)]
     
-    # Load keywords from file and populate the trie
-    def load_keywords_from_file(self, filename):
+    # Load keywords from a (possibly gzip/bz2/xz compressed) file and populate the trie.
+    # Returns the keyword_io stats dict, or None if the file could not be read.
+    def load_keywords_from_file(self, filename, verbose=True, workers=1):
         try:
-            with open(filename, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        if ',' in line:
-                            word, freq_str = line.rsplit(',', 1)
-                            try:
-                                freq = int(freq_str)
-                            except ValueError:
-                                freq = 1
-                            for _ in range(freq):
-                                self.insert(word)
-            print(f"Keywords loaded from '{filename}'.")
+            stats = load_keywords(self, filename, workers=workers)
         except FileNotFoundError:
             print(f"File '{filename}' not found.")
+            return None
+        if verbose:
+            print(f"Keywords loaded from '{filename}'.")
+        return stats
     
+    # Save the trie as a binary snapshot (see trie_snapshot.py)
+    def save_snapshot(self, filename):
+        try:
+            count = write_snapshot(self, filename)
+            print(f"Trie snapshot ({count} nodes) saved to '{filename}'.")
+        except OSError as e:
+            print(f"Error saving snapshot '{filename}': {e}")
+
+    # Load a binary snapshot. An empty trie adopts the snapshot's nodes directly;
+    # otherwise the snapshot's words are added to the existing ones.
+    def load_snapshot(self, filename):
+        try:
+            root, nodes = read_snapshot(filename, TrieNode)
+        except FileNotFoundError:
+            print(f"File '{filename}' not found.")
+            return
+        except ValueError as e:
+            print(f"Invalid snapshot '{filename}': {e}")
+            return
+
+        self._adopt_nodes(root, nodes)
+        print(f"Trie snapshot loaded from '{filename}'.")
+
+    # Load a file in the bracketed format written by save_trie_visual (see trie_visual.py)
+    def load_trie_visual(self, filename):
+        try:
+            root, nodes = read_trie_visual(filename, TrieNode)
+        except FileNotFoundError:
+            print(f"File '{filename}' not found.")
+            return
+        except ValueError as e:
+            print(f"Invalid trie visual file '{filename}': {e}")
+            return
+
+        self._adopt_nodes(root, nodes)
+        print(f"Trie visual loaded from '{filename}'.")
+
+    # Take over a directly built node structure. An empty trie adopts the nodes
+    # as they are; otherwise (or when normalising) their words are added to the
+    # existing ones.
+    def _adopt_nodes(self, root, nodes):
+        if self._normalize or self.root.children or self.root.is_end_of_word:
+            other = Trie()
+            other.root = root
+            self.insert_many(other._iter_word_freqs())
+        else:
+            self.root = root
+            self._rebuild_aggregates(nodes)
+
+    # Load a binary snapshot, a trie visual file or a 'word,freq' keyword file,
+    # then replay any edits journaled for it since it was last written (see trie_journal.py)
+    def load_file(self, filename):
+        if is_snapshot_file(filename):
+            self.load_snapshot(filename)
+        elif is_visual_file(filename):
+            self.load_trie_visual(filename)
+        else:
+            self.load_keywords_from_file(filename)
+        edits = replay_journal(self, filename)
+        if edits:
+            print(f"Replayed {edits} journaled edit(s) for '{filename}'.")
+
     # Save visual representation of the trie to file
     def save_trie_visual(self, filename):
         try:
-            with open(filename, 'w') as f:
-                def _display_to_file(current, prefix, depth):
-                    indent = '.' * depth
-                    lines = []
-                    
-                    # Print prefix
-                    lines.append(indent + '[' + prefix)
-
-                    # If it's a word, print frequency
-                    if current.is_end_of_word:
-                        lines.append('.' * (depth + 1) + f">{prefix}({current.frequency})*")
-
-                    # Recurse into children
-                    for ch, next_node in sorted(current.children.items()):
-                        lines.extend(_display_to_file(next_node, prefix + ch, depth + 1))
-
-                    # Closing bracket
-                    lines.append(indent + ']')
-                    return lines
-
-                # Start from root
-                lines = ["["]
-                for ch, next_node in sorted(self.root.children.items()):
-                    lines.extend(_display_to_file(next_node, ch, 1))
-                lines.append("]")
-
-                # Write lines into file
-                for line in lines:
-                    f.write(line + "\n")
-
+            with open(filename, 'w', buffering=VISUAL_WRITE_BUFFER) as f:
+                self.write_visual(f)
             print(f"Trie visual saved to '{filename}'.")
         except Exception as e:
             print(f"Error saving trie visual: {e}")
 
-    # Save Keywords to File
-    def save_keywords_to_file(self, filename):
+    # Save Keywords to File (compressed if the name ends in .gz/.bz2/.xz).
+    # Returns the keyword_io stats dict, or None if the file could not be written.
+    def save_keywords_to_file(self, filename, verbose=True):
         try:
-            with open(filename, 'w') as f:
-                all_words = self.get_all_words_with_freq()
-                for word, freq in sorted(all_words):
-                    f.write(f"{word},{freq}\n")
-            print(f"Keywords saved to '{filename}'.")
+            stats = save_keywords(self, filename)
         except Exception as e:
             print(f"Error saving to file '{filename}': {e}")
+            return None
+        if verbose:
+            print(f"Keywords saved to '{filename}'.")
+        return stats
     
-    # Get predictions with support for wildcards '*'
+    # Get predictions with support for wildcards '*' (cached)
     def get_words_with_prefix(self, prefix, max_results=50):
-        results = []
+        prefix = self._key(prefix)
+        results = self.query_cache.get(('prefix', prefix, max_results), self.version,
+                                       lambda: self._get_words_with_prefix(prefix, max_results))
+        return list(results)
 
-        def _dfs(node, current_prefix, index):
-            if len(results) >= max_results:
-                return
+    def _get_words_with_prefix(self, prefix, max_results):
+        results = []
+        buffer = []
+        stack = [(self.root, '', 0, 0)]  # (node, edge char, index into prefix, depth)
+        while stack and len(results) < max_results:
+            node, ch, index, depth = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(ch)
 
             if index == len(prefix):
                 if node.is_end_of_word:
-                    results.append((current_prefix, node.frequency))
-                for ch, next_node in node.children.items():
-                    _dfs(next_node, current_prefix + ch, index)
-                return
+                    results.append((''.join(buffer), node.frequency))
+                stack.extend((child, next_ch, index, depth + 1) for next_ch, child in reversed(node.children.items()))
+                continue
 
             ch = prefix[index]
             if ch == '*':
-                for next_ch, next_node in node.children.items():
-                    _dfs(next_node, current_prefix + next_ch, index + 1)
-                    if len(results) >= max_results:
-                        return
+                stack.extend((child, next_ch, index + 1, depth + 1) for next_ch, child in reversed(node.children.items()))
             elif ch in node.children:
-                _dfs(node.children[ch], current_prefix + ch, index + 1)
-
-        _dfs(self.root, '', 0)
+                stack.append((node.children[ch], ch, index + 1, depth + 1))
         return results
 
+    # Return the k most frequent completions of prefix (with '*' wildcards) in frequency order.
+    # Best-first search on the cached subtree maxima, so only the branches that can
+    # still contribute to the top k are expanded. Ties are broken alphabetically.
+    def top_k(self, prefix, k=3):
+        return CompletionCursor(self, prefix).top(k)
+
+    # Cursor positioned at prefix that can be extended character by character
+    # and yields ranked completions lazily (see completion_cursor.py)
+    def completion_cursor(self, prefix=''):
+        return CompletionCursor(self, prefix)
+
+    # Restore a pattern to its most frequent matching word ('*' matches one character).
+    # Branch-and-bound: a branch is skipped when its subtree maximum cannot beat the
+    # best word found so far or its longest word is too short for the pattern, and
+    # wildcard children are tried in descending max_freq order. Ties resolve to the
+    # word that comes first in insertion order, as the exhaustive search did.
     def find_best_match(self, pattern):
-        best_match = ("", -1)
-        memo = {}
+        self.last_match_visits = 0  # stays 0 when the answer comes from the cache
+        pattern = self._key(pattern)
+        return self.query_cache.get(('best', pattern), self.version,
+                                    lambda: self._spelling(self._find_best_match(pattern)))
 
-        def _dfs(node, index, path):
-            nonlocal best_match
+    # The most frequent spelling of a stored key (the key itself on a trie that does not normalise)
+    def _spelling(self, key):
+        if key is None or not self._normalize:
+            return key
+        return _preferred_spelling(self._find_node(key)) or key
 
-            key = (id(node), index)
-            if key in memo and memo[key] >= best_match[1]:
-                return
-            memo[key] = best_match[1]
+    def _find_best_match(self, pattern):
+        best_word, best_freq, best_order = None, 0, None
+        visits = 0
+        length = len(pattern)
+        buffer = []
+        order = []  # child positions along the current path, for tie-breaking
+        stack = [(self.root, '', 0, 0)]  # (node, edge char, index into pattern, child position)
+        while stack:
+            node, ch, index, pos = stack.pop()
+            bound = node.max_freq
+            if bound == 0 or bound < best_freq or node.height < length - index:
+                continue
+            if index:
+                del buffer[index - 1:]
+                del order[index - 1:]
+                buffer.append(ch)
+                order.append(pos)
+            if bound == best_freq and order >= best_order:
+                continue  # can only tie with a word that comes later
+            visits += 1
 
-            if index == len(pattern):
-                if node.is_end_of_word and node.frequency > best_match[1]:
-                    best_match = (path, node.frequency)
-                return
+            if index == length:
+                if node.is_end_of_word and (node.frequency > best_freq
+                                            or (node.frequency == best_freq and order < best_order)):
+                    best_word, best_freq, best_order = ''.join(buffer), node.frequency, order[:]
+                continue
 
             ch = pattern[index]
             if ch == '*':
-                for next_ch, child in node.children.items():
-                    _dfs(child, index + 1, path + next_ch)
+                ranked = sorted(enumerate(node.children.items()), key=lambda e: (-e[1][1].max_freq, e[0]))
+                for next_pos, (next_ch, child) in reversed(ranked):
+                    stack.append((child, next_ch, index + 1, next_pos))
             elif ch in node.children:
-                _dfs(node.children[ch], index + 1, path + ch)
+                # Fixed characters are shared by every candidate, so their position is irrelevant
+                stack.append((node.children[ch], ch, index + 1, 0))
 
-        _dfs(self.root, 0, "")
-        return best_match[0] if best_match[1] > 0 else None
+        self.last_match_visits = visits
+        return best_word
     
+    # Return up to k words within max_edits edits (insertions, deletions,
+    # substitutions and swaps of two adjacent characters) of word as
+    # (word, freq, distance), closest first, then most frequent, then alphabetical.
+    # '*' in word matches any one character for free.
+    # The trie is walked depth-first carrying one edit-distance row per node, and a
+    # subtree is skipped once every entry of its row exceeds the budget; when k words
+    # have been found the budget shrinks to the worst distance among them.
+    def fuzzy_search(self, word, max_edits=2, k=5):
+        word = self._key(word)
+        results = self.query_cache.get(('fuzzy', word, max_edits, k), self.version,
+                                       lambda: self._fuzzy_search(word, max_edits, k))
+        return list(results)
+
+    def _fuzzy_search(self, word, max_edits, k):
+        if k <= 0 or max_edits < 0:
+            return []
+        length = len(word)
+        # Heap of the k best so far as (-distance, freq, key), worst on top. The key
+        # orders words alphabetically in reverse: negated character codes plus a
+        # terminator that makes a word rank above its own extensions
+        best = []
+        budget = max_edits
+        buffer = []
+        rows = []  # rows[d]: edit-distance row for the node at depth d on the current path
+        stack = [(self.root, '', 0)]
+        while stack:
+            node, ch, depth = stack.pop()
+            del rows[depth:]
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(ch)
+                prev = rows[-1]
+                prev_ch = buffer[depth - 2] if depth > 1 else None
+                row = [prev[0] + 1]
+                for i in range(1, length + 1):
+                    target = word[i - 1]
+                    cost = 0 if target == ch or target == '*' else 1
+                    value = min(row[i - 1] + 1, prev[i] + 1, prev[i - 1] + cost)
+                    if i > 1 and prev_ch is not None and target == prev_ch and word[i - 2] == ch:
+                        value = min(value, rows[-2][i - 2] + 1)  # adjacent swap
+                    row.append(value)
+            else:
+                row = list(range(length + 1))
+            rows.append(row)
+
+            distance = row[length]
+            if node.is_end_of_word and distance <= budget:
+                entry = (-distance, node.frequency, tuple(-ord(c) for c in buffer) + (1,))
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+                if len(best) == k:
+                    budget = -best[0][0]
+
+            # Every word below is at least this far: the row minimum, and the
+            # characters of word that even the longest word below cannot reach
+            if min(row) <= budget and length - (depth + node.height) <= budget:
+                for next_ch, child in reversed(node.children.items()):
+                    stack.append((child, next_ch, depth + 1))
+
+        return [(''.join(chr(-c) for c in key[:-1]), freq, -neg_distance)
+                for neg_distance, freq, key in sorted(best, reverse=True)]
+
     def separate_words(self, text):
         return text.strip().split()
 
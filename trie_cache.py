@@ -0,0 +1,89 @@
+# ----------------------------------------
+# trie_cache.py
+# Shared cache of tries loaded from files
+# ----------------------------------------
+#
+# Entries are keyed by absolute path and remembered with the file's size and
+# modification time (and those of its edit journal), so an edited file is
+# reloaded automatically. The total
+# estimated size of the cached tries is kept under a memory budget by
+# evicting the least recently used entries.
+#
+# Cached tries are shared: callers must treat them as read-only (use
+# Trie.merge to take a private copy before editing).
+
+import os
+from collections import OrderedDict
+
+from trie import Trie
+from trie_journal import journal_stamp
+
+APPROX_NODE_BYTES = 280  # measured size of a TrieNode with its children dict
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+class TrieFileCache:
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.entries = OrderedDict()  # path -> (stamp, trie_class, trie, cost)
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Return a trie for filename, loading it only if it is not cached or the
+    # file changed since it was loaded
+    def get(self, filename, trie_class=Trie, verbose=True):
+        path = os.path.abspath(filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            trie = trie_class()
+            trie.load_file(filename)  # reports the missing file as usual
+            return trie
+
+        stamp = (st.st_size, st.st_mtime_ns, journal_stamp(path))
+        entry = self.entries.get(path)
+        if entry is not None:
+            cached_stamp, cached_class, trie, _ = entry
+            if cached_stamp == stamp and cached_class is trie_class:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                if verbose:
+                    print(f"Using cached trie for '{filename}'.")
+                return trie
+            self._remove(path)
+
+        self.misses += 1
+        trie = trie_class()
+        trie.load_file(filename)
+        cost = trie.node_count() * APPROX_NODE_BYTES
+        if cost <= self.memory_budget:
+            self.entries[path] = (stamp, trie_class, trie, cost)
+            self.used += cost
+            while self.used > self.memory_budget:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return trie
+
+    def _remove(self, path):
+        self.used -= self.entries.pop(path)[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.used = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'used_bytes': self.used,
+            'budget_bytes': self.memory_budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Cache shared by the command prompts and feature menus
+shared_trie_cache = TrieFileCache()
@@ -19,7 +19,7 @@ class TrieEditor:
         path = UI.get_trie_folder_and_file()
         if path:
             self.trie = Trie()  # Reset current trie
-            self.trie.load_keywords_from_file(path)
+            self.trie.load_file(path)  # keyword, snapshot or trie visual file
             print("Trie loaded from selected file.")
         else:
             print("No file selected.")
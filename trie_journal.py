@@ -0,0 +1,159 @@
+# ----------------------------------------
+# trie_journal.py
+# Append-only edit journal kept next to a keyword file
+# ----------------------------------------
+#
+# Edits to 'file.txt' are appended to 'file.txt.journal' instead of rewriting
+# the whole file:
+#
+#   #base 1234 1700000000000000000    size and mtime_ns of file.txt when the journal started
+#   +cat                               one occurrence of 'cat' added
+#   -cat                               one occurrence of 'cat' removed
+#   =cat<TAB>dog                       'cat' renamed to 'dog'
+#
+# Trie.load_file replays the journal on top of the base file. Once the journal
+# holds more than compact_threshold edits it is folded into a rewritten base
+# file (same format: snapshot, trie visual or keyword file) and removed. The
+# header ties a journal to one version of the base file, so a journal left
+# behind after the base was rewritten is never replayed twice.
+
+import os
+
+from keyword_io import save_keywords
+from trie_snapshot import is_snapshot_file, write_snapshot
+from trie_visual import is_visual_file
+
+JOURNAL_SUFFIX = '.journal'
+DEFAULT_COMPACT_THRESHOLD = 1000  # journaled edits before the base file is rewritten
+
+
+def journal_path(filename):
+    return filename + JOURNAL_SUFFIX
+
+
+# (size, mtime_ns) of the journal for filename, None if there is none
+def journal_stamp(filename):
+    try:
+        st = os.stat(journal_path(filename))
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _base_header(filename):
+    st = os.stat(filename)
+    return f"#base {st.st_size} {st.st_mtime_ns}"
+
+
+# Read the edits journaled for filename as (op, args) tuples.
+# Returns None if there is no journal or it belongs to an older base file.
+def read_journal(filename):
+    try:
+        with open(journal_path(filename), 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    try:
+        current = _base_header(filename)
+    except OSError:
+        return None
+    if not lines or lines[0] != current:
+        return None
+
+    edits = []
+    for line in lines[1:]:
+        if len(line) < 2:
+            continue
+        op, rest = line[0], line[1:]
+        if op in '+-':
+            edits.append((op, (rest,)))
+        elif op == '=' and '\t' in rest:
+            edits.append((op, tuple(rest.split('\t', 1))))
+    return edits
+
+
+# Apply one journaled edit to trie
+def apply_edit(trie, op, args):
+    if op == '+':
+        trie.insert(args[0])
+    elif op == '-':
+        trie.delete(args[0])
+    elif op == '=':
+        trie.rename(args[0], args[1])
+
+
+# Replay the journal of filename onto trie. Returns the number of edits applied.
+def replay_journal(trie, filename):
+    edits = read_journal(filename)
+    if not edits:
+        return 0
+    for op, args in edits:
+        apply_edit(trie, op, args)
+    return len(edits)
+
+
+# ----------------------- Edit Journal Class -----------------------
+# Writer side of the journal for one base file
+class EditJournal:
+    def __init__(self, filename, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.filename = filename
+        self.path = journal_path(filename)
+        self.compact_threshold = compact_threshold
+        edits = read_journal(filename)
+        self.entries = len(edits) if edits is not None else 0
+        self._valid = edits is not None  # False: missing or stale, start a new one
+
+    # Append edits ('+', word) / ('-', word) / ('=', old, new); one write, no rewrite of the base
+    def append(self, edits):
+        lines = []
+        for op, *words in edits:
+            lines.append(op + '\t'.join(words) + '\n')
+        if not lines:
+            return
+        if self._valid:
+            mode, header = 'a', ''
+        else:
+            mode, header = 'w', _base_header(self.filename) + '\n'
+        with open(self.path, mode, encoding='utf-8') as f:
+            f.write(header + ''.join(lines))
+        self._valid = True
+        self.entries += len(lines)
+
+    def record_insert(self, word):
+        self.append([('+', word)])
+
+    def record_delete(self, word):
+        self.append([('-', word)])
+
+    def record_rename(self, old, new):
+        self.append([('=', old, new)])
+
+    # Fold the journal into the base file: trie (already holding every
+    # journaled edit) is written over the base in the base's own format and
+    # the journal is removed
+    def compact(self, trie):
+        directory, name = os.path.split(self.filename)
+        tmp = os.path.join(directory, '.compact-' + name)  # keeps the extension (.gz etc.)
+        if is_snapshot_file(self.filename):
+            write_snapshot(trie, tmp)
+        elif is_visual_file(self.filename):
+            with open(tmp, 'w') as f:
+                trie.write_visual(f)
+        else:
+            save_keywords(trie, tmp)
+        os.replace(tmp, self.filename)
+        # The new base no longer matches the journal header, so even if the
+        # removal below fails the old edits are not replayed again
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.entries = 0
+        self._valid = False
+
+    # Compact once the journal has grown past the threshold. Returns True if it did.
+    def maybe_compact(self, trie):
+        if self.entries > self.compact_threshold:
+            self.compact(trie)
+            return True
+        return False
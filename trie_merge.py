@@ -0,0 +1,82 @@
+# ----------------------------------------
+# trie_merge.py
+# Parallel multi-file loading and merging
+# ----------------------------------------
+#
+# Each input file is loaded into its own trie by a worker process, then the
+# tries are merged pairwise (also in the pool) until one is left. Tries move
+# between processes as binary snapshots in temporary files, which avoids
+# pickling deeply nested node objects.
+
+import contextlib
+import os
+import tempfile
+from multiprocessing import Pool
+
+from trie import Trie
+from trie_snapshot import write_snapshot
+
+
+def _temp_snapshot_path():
+    fd, path = tempfile.mkstemp(suffix='.snap', prefix='trie_merge_')
+    os.close(fd)
+    return path
+
+
+def _read_trie(path):
+    trie = Trie()
+    trie.load_snapshot(path)
+    return trie
+
+
+# Run func with stdout silenced; the loaders print a line per file
+def _quietly(func, *args):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return func(*args)
+
+
+# Worker: load one keyword/snapshot/visual file and write it as a snapshot
+def _load_to_snapshot(filename):
+    trie = Trie()
+    _quietly(trie.load_file, filename)
+    path = _temp_snapshot_path()
+    write_snapshot(trie, path)
+    return path
+
+
+# Worker: merge two snapshots into a new one, removing the inputs
+def _merge_snapshots(paths):
+    left_path, right_path = paths
+    left = _quietly(_read_trie, left_path)
+    right = _quietly(_read_trie, right_path)
+    left.merge(right, consume=True)
+    os.remove(left_path)
+    os.remove(right_path)
+    path = _temp_snapshot_path()
+    write_snapshot(left, path)
+    return path
+
+
+# Load every file into its own trie and reduce them pairwise into one Trie.
+# Files that do not exist are skipped by the loaders like a normal '~'.
+def merge_files(filenames, workers=None):
+    if not filenames:
+        return Trie()
+    workers = workers if workers is not None else min(len(filenames), os.cpu_count() or 1)
+
+    with Pool(max(workers, 1)) as pool:
+        paths = pool.map(_load_to_snapshot, filenames)
+        try:
+            while len(paths) > 1:
+                pairs = [(paths[i], paths[i + 1]) for i in range(0, len(paths) - 1, 2)]
+                leftover = [paths[-1]] if len(paths) % 2 else []
+                paths = pool.map(_merge_snapshots, pairs) + leftover
+        except Exception:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+
+    merged = _quietly(_read_trie, paths[0])
+    os.remove(paths[0])
+    return merged
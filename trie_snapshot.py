@@ -0,0 +1,108 @@
+# ----------------------------------------
+# trie_snapshot.py
+# Versioned binary snapshot format for tries
+# ----------------------------------------
+#
+# Layout (little-endian):
+#   header   magic b'TRIESNAP', format version (uint16), flags (uint16),
+#            node count (uint64), CRC32 of the body (uint32)
+#   body     child_count[n] (uint32), edge_char[n] (uint32), frequency[n] (int64)
+#
+# Nodes are stored in preorder with children in insertion order, so the trie
+# can be rebuilt in one pass from a single bulk read. A frequency of 0 marks
+# a node that does not end a word.
+
+import struct
+import sys
+import zlib
+from array import array
+
+SNAPSHOT_MAGIC = b'TRIESNAP'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('<8sHHQI')
+
+
+# Check whether a file starts with the snapshot magic
+def is_snapshot_file(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+    except OSError:
+        return False
+
+
+def _to_little_endian(arr):
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+# Write the trie to filename as a binary snapshot
+def write_snapshot(trie, filename):
+    child_count = array('I')
+    edge_char = array('I')
+    frequency = array('q')
+
+    stack = [(trie.root, '')]
+    while stack:
+        node, ch = stack.pop()
+        child_count.append(len(node.children))
+        edge_char.append(ord(ch) if ch else 0)
+        frequency.append(node.frequency if node.is_end_of_word else 0)
+        stack.extend((child, next_ch) for next_ch, child in reversed(node.children.items()))
+
+    body = b''.join(_to_little_endian(a).tobytes() for a in (child_count, edge_char, frequency))
+    with open(filename, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(child_count), zlib.crc32(body)))
+        f.write(body)
+    return len(child_count)
+
+
+# Read a snapshot into a fresh root node of the given class.
+# Returns (root, nodes in preorder); raises ValueError for a bad or corrupt file.
+def read_snapshot(filename, node_class):
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError("file is too short to be a trie snapshot")
+    magic, version, _, count, checksum = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a trie snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    body = memoryview(data)[_HEADER.size:]
+    if len(body) != count * 16 or zlib.crc32(body) != checksum:
+        raise ValueError("snapshot checksum mismatch")
+
+    child_count = array('I')
+    edge_char = array('I')
+    frequency = array('q')
+    child_count.frombytes(body[:count * 4])
+    edge_char.frombytes(body[count * 4:count * 8])
+    frequency.frombytes(body[count * 8:])
+    for arr in (child_count, edge_char, frequency):
+        _to_little_endian(arr)
+
+    # Rebuild in preorder: the parent of each node is the deepest open node
+    # that still expects children
+    nodes = []
+    open_nodes = []  # [node, children still to attach]
+    for children, code, freq in zip(child_count.tolist(), edge_char.tolist(), frequency.tolist()):
+        node = node_class()
+        if freq:
+            node.is_end_of_word = True
+            node.frequency = freq
+        if open_nodes:
+            parent = open_nodes[-1]
+            parent[0].children[chr(code)] = node
+            parent[1] -= 1
+            if parent[1] == 0:
+                open_nodes.pop()
+        if children:
+            open_nodes.append([node, children])
+        nodes.append(node)
+
+    if not nodes:
+        raise ValueError("snapshot has no root node")
+    return nodes[0], nodes
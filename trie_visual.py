@@ -0,0 +1,92 @@
+# ----------------------------------------
+# trie_visual.py
+# Loader for the bracketed visual format written by save_trie_visual
+# ----------------------------------------
+#
+#   [                 root
+#   .[c               node for prefix 'c' (one dot per character)
+#   ..[ca
+#   ...[car
+#   ....>car(3)*      'car' is a word with frequency 3
+#   ...]              end of the 'car' node
+#   ..]
+#   .]
+#   ]
+#
+# The file is read line by line and nodes are attached from the bracket
+# nesting, so no word is re-inserted from the root.
+
+
+# Check whether a file starts with the visual format's root bracket
+def is_visual_file(filename):
+    try:
+        with open(filename, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    return line == '['
+    except (OSError, UnicodeDecodeError):
+        pass
+    return False
+
+
+# Parse a visual file into a fresh root node of the given class.
+# Returns (root, nodes in preorder); raises ValueError for a malformed file.
+def read_trie_visual(filename, node_class):
+    root = None
+    nodes = []
+    stack = []  # open nodes, root first; a node at depth d has d dots
+
+    with open(filename, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line:
+                continue
+
+            if root is None:
+                if line != '[':
+                    raise ValueError(f"line {line_no}: expected '[' to open the root")
+                root = node_class()
+                nodes.append(root)
+                stack.append(root)
+                continue
+            if not stack:
+                raise ValueError(f"line {line_no}: content after the closing ']'")
+
+            depth = len(stack)
+            rest = line[depth:] if line.startswith('.' * depth) else None
+
+            if rest and rest[0] == '[':
+                # Opening a child: its prefix is one character longer than the parent's
+                path = rest[1:]
+                if len(path) != depth:
+                    raise ValueError(f"line {line_no}: prefix '{path}' does not match its depth")
+                node = node_class()
+                stack[-1].children[path[-1]] = node
+                nodes.append(node)
+                stack.append(node)
+
+            elif rest and rest[0] == '>':
+                # Word line for the innermost open node: >word(freq)*
+                entry = rest[1:].rstrip('*')
+                word, sep, freq_str = entry.rpartition('(')
+                try:
+                    freq = int(freq_str.rstrip(')'))
+                except ValueError:
+                    freq = 0
+                if not sep or len(word) != depth - 1 or freq <= 0:
+                    raise ValueError(f"line {line_no}: malformed word entry '{rest}'")
+                stack[-1].is_end_of_word = True
+                stack[-1].frequency = freq
+
+            elif line == '.' * (depth - 1) + ']':
+                stack.pop()
+
+            else:
+                raise ValueError(f"line {line_no}: unexpected line '{line}'")
+
+    if root is None:
+        raise ValueError("file is empty")
+    if stack:
+        raise ValueError("unexpected end of file, missing ']'")
+    return root, nodes
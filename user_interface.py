@@ -1,4 +1,5 @@
 import os
+import sys
 
 #Class Created By Stephen
 class UserInterface():
@@ -35,15 +36,20 @@ class UserInterface():
     def construct_edit(self, show_empty_trie=True):
         print("------------------------------------------------------------")
         print("Construct/Edit Trie Commands:")
-        print("    '+','.','?','#','@','~','=','!','\\'")
+        print("    '+','.','?','#','@','~','=','%','<','>','^','&','!','\\'")
         print("------------------------------------------------------------")
         print("    +sunshine       (add a keyword)")
         print("    -moonlight      (delete a keyword)")
         print("    ?rainbow        (find a keyword)")
-        print("    #               (display Trie)")
+        print("    #               (display Trie, e.g. #car depth=5 lines=200)")
         print("    @               (write Trie to file)")
-        print("    ~               (read keywords from file to make Trie)")
+        print("    ~               (read keywords or snapshot file to make Trie)")
         print("    =               (write keywords from Trie to file)")
+        print("    %               (write binary snapshot of Trie to file)")
+        print("    <               (undo the last edit)")
+        print("    >               (redo the last undone edit)")
+        print("    ^name           (save a named checkpoint, ^ alone lists them)")
+        print("    &name           (go back to a named checkpoint)")
         print("    !               (print instructions)")
         print("    \\              (exit\")")
         print("------------------------------------------------------------")
@@ -56,14 +62,16 @@ class UserInterface():
     def predict_restore(self):
         print("------------------------------------------------------------")
         print("Predict/Restore Text Commands:")
-        print("    '~','#','$','?','&','@','!','\\'")
+        print("    '~','#','$','?','&','@','>','%','!','\\'")
         print("------------------------------------------------------------")
         print("    ~               (read keywords from file to make Trie)")
-        print("    #               (display Trie)")
+        print("    #               (display Trie, e.g. #car depth=5 lines=200)")
         print("    $ra*nb*w        (list all possible matching keywords)")
         print("    ?ra*nb*w        (restore a word using best keyword match)")
         print("    &               (restore a text using all matching keywords)")
         print("    @               (restore a text using best keywords)")
+        print("    >               (restore a text file into another file)")
+        print("    %               (show query cache statistics)")
         print("    !               (print instructions)")
         print("    \\              (exit\")")
         print("------------------------------------------------------------")
@@ -106,16 +114,53 @@ class UserInterface():
                 print(f"{i} : {guess}")
         print("------------------------------------------------------------")
     
+    # Ask for a folder and a file inside it; returns the file path or None (Aaron)
+    # Files can hold 'word,freq' keywords, a binary snapshot or a trie visual
+    def get_trie_folder_and_file(self, default_folder='trieFolder'):
+        folder = input(f"Enter folder name (press Enter for '{default_folder}'): ").strip() or default_folder
+        if not os.path.isdir(folder):
+            print(f"Folder '{folder}' not found.")
+            return None
+
+        files = sorted(name for name in os.listdir(folder) if os.path.isfile(os.path.join(folder, name)))
+        if not files:
+            print(f"No files found in '{folder}'.")
+            return None
+
+        print(f"Files in '{folder}':")
+        for i, name in enumerate(files, 1):
+            print(f"    {i}. {name}")
+        choice = input("Enter file number or name: ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(files):
+            return os.path.join(folder, files[int(choice) - 1])
+        if choice in files:
+            return os.path.join(folder, choice)
+        print("Invalid choice.")
+        return None
+
+    # Print lines one page at a time when running in a terminal (Aaron)
+    def page_output(self, lines, page_size=40):
+        paged = sys.stdin.isatty() and sys.stdout.isatty()
+        shown = 0
+        for line in lines:
+            print(line)
+            shown += 1
+            if paged and shown % page_size == 0:
+                more = input("-- More -- (Enter to continue, q to stop) ").strip().lower()
+                if more == 'q':
+                    break
+
     # Function to display Feature 5: Advanced Trie Tools (Aaron)
     def display_advanced_trie_tools(self):
         print("----------------------------------------------------------------------")
         print("Advanced Trie Tools - Feature 5 (Aaron Ng)")
         print("----------------------------------------------------------------------")
-        print("    ~file1,file2    (load and merge two Trie keyword files into one)")
+        print("    ~file1,file2,.. (load and merge Trie keyword files into one)")
         print("    >file.txt       (show top keywords by frequency from a file)")
         print("    +               (add a keyword to a TXT file and update Trie)")
         print("    -               (remove a keyword from a TXT file and update Trie)")
         print("    ^               (replace 'old' keyword with 'new' in current Trie)")
+        print("    ^renames.txt    (apply every 'old,new' line of a file as a rename)")
         print("    !               (print instructions again)")
         print("    \\               (exit)")
         print("----------------------------------------------------------------------")
@@ -126,11 +171,13 @@ class UserInterface():
         print("Extra Feature Two - Keyword Tools (Aaron Ng)")
         print("----------------------------------------------------------------------")
         print("    =file1,file2   (Compare common keywords in both TXT files)")
+        print("    -file1,file2   (Show keywords found in only one of the TXT files)")
         print("    >from,to       (Transfer a keyword from one TXT file to another)")
         print("    #file.txt      (Show keywords from longest to shortest)")
         print("    *file.txt      (Group keywords alphabetically by first letter)")
         print("    %file.txt      (Show most frequent starting letters)")
         print("    $file.txt      (List palindromic keywords)")
+        print("    &file.txt      (Show length, branching and depth statistics)")
         print("    !              (Print instructions again)")
         print("    \\              (Exit this feature)")
         print("----------------------------------------------------------------------")
\ No newline at end of file